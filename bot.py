@@ -5,6 +5,11 @@ from dotenv import load_dotenv
 from setup.setup import *
 from commands import help_commands, ping_commands, quote_commands, pokemon_commands, credit_commands, trade_commands, tournament_commands, event_commands, profile_commands, admin_commands, ai_commands
 from data.minigames import active_pokemon_guesses, evaluate_guess
+from data.http_client import start_http_session, close_http_session
+from data.pokeapi_cache import pokeapi_cache
+from data.renderer import shutdown_renderer
+from data.database import db
+from data.pokedex import start_pokedex_build
 
 # Load the .env file
 load_dotenv()
@@ -18,9 +23,26 @@ intents.message_content = True  # Need this to read message content
 # Check the value of the ENVIRONMENT variable
 guilds = setup_guilds()
 
+class AnkiBotClient(discord.Client):
+    """Discord client that also manages the lifetime of our shared resources."""
+
+    async def setup_hook(self):
+        # Open the shared HTTP connection pool before any command can run
+        await start_http_session()
+        db.start_checkpoints()
+        # On the first start, build the Pokédex dataset the name lookups and autocomplete read from
+        start_pokedex_build()
+
+    async def close(self):
+        await close_http_session()
+        await pokeapi_cache.close()
+        shutdown_renderer()
+        await db.close()
+        await super().close()
+
 # Functions:
 has_synced = False
-client = discord.Client(intents=intents)
+client = AnkiBotClient(intents=intents)
 tree = app_commands.CommandTree(client)
 ai_channels = os.getenv("AI_CHANNELS", "").split(",")
 forum_channels = os.getenv("FORUM_CHANNELS", "").split(",")
@@ -4,7 +4,7 @@ from discord.app_commands import default_permissions
 import json
 import datetime
 from typing import Optional, List
-from data.profiles import award_badge, award_badges_to_users, get_badge_details, get_all_badges
+from data.profiles import award_badge, award_badges_to_users, get_badge_details, get_all_badges, invalidate_profiles
 from data.badges import get_badge_id
 from data.database import db
 from data.events import (
@@ -21,7 +21,7 @@ EVENT_TYPE_CHOICES = [
 # Badge autocomplete function
 async def badge_name_autocomplete(interaction: discord.Interaction, current: str):
     """Autocomplete function for badge names."""
-    badges = get_all_badges()
+    badges = await get_all_badges()
     
     return [
         discord.app_commands.Choice(name=badge["name"], value=badge["name"])
@@ -48,7 +48,7 @@ async def award_badge_command(
     await interaction.response.defer(ephemeral=True)
     
     # Validate the badge
-    badge_id = get_badge_id(badge_name)
+    badge_id = await get_badge_id(badge_name)
     if badge_id == -1:
         await interaction.followup.send(f"Invalid badge name: {badge_name}", ephemeral=True)
         return
@@ -58,7 +58,7 @@ async def award_badge_command(
         reason = f"Awarded by {interaction.user.display_name}"
     
     # Award the badge
-    success = award_badge(user.id, badge_name, reason)
+    success = await award_badge(user.id, badge_name, reason)
     
     if success:
         # Format the emoji correctly
@@ -117,11 +117,11 @@ async def badge_add_command(
         description = f"The {badge_name} badge"
     
     # Check if badge already exists
-    existing_badge = get_badge_details(badge_name)
+    existing_badge = await get_badge_details(badge_name)
     
     if existing_badge:
         # Update existing badge
-        db.execute(
+        await db.execute(
             """UPDATE badges 
                SET emoji_id = ?, locked_emoji_id = ?, description = ? 
                WHERE name = ?""",
@@ -130,13 +130,16 @@ async def badge_add_command(
         action = "updated"
     else:
         # Insert new badge
-        db.execute(
+        await db.execute(
             """INSERT INTO badges (name, emoji_id, locked_emoji_id, description) 
                VALUES (?, ?, ?, ?)""",
             (badge_name, emoji_id_int, locked_emoji_id_int, description)
         )
         action = "added"
     
+    # Profiles show the badge emojis, so they have to be read again
+    invalidate_profiles()
+    
     # Create response embed
     embed = discord.Embed(
         title=f"Badge {action.capitalize()}",
@@ -160,7 +163,7 @@ async def badge_list_command(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     # Get all badges from the database
-    badges = get_all_badges()
+    badges = await get_all_badges()
     
     if not badges:
         await interaction.followup.send("No badges found in the database.", ephemeral=True)
@@ -249,7 +252,7 @@ async def event_create(
     # Set badge reward if provided
     if badge_reward:
         # Validate the badge name
-        badge_id = get_badge_id(badge_reward)
+        badge_id = await get_badge_id(badge_reward)
         if badge_id == -1:
             await interaction.followup.send(f"Invalid badge name: {badge_reward}. The event was created but no badge reward was set.", ephemeral=True)
         else:
@@ -311,7 +314,7 @@ async def event_end(interaction: discord.Interaction, event_name: str):
     # Add badge reward info if applicable
     if results.get("badge_awarded"):
         badge_name = results["badge_awarded"]
-        badge_id = get_badge_id(badge_name)
+        badge_id = await get_badge_id(badge_name)
         
         badge_display = f"<:{badge_name}:{badge_id}>" if badge_id != -1 else badge_name
         
@@ -333,7 +336,7 @@ async def event_end(interaction: discord.Interaction, event_name: str):
         if qualified_users:
             # Include event name in the acquisition source
             acquisition_source = f"Completed {results['name']} event"
-            award_results = award_badges_to_users(qualified_users, badge_name, acquisition_source)
+            award_results = await award_badges_to_users(qualified_users, badge_name, acquisition_source)
             
             # Create a list of users who earned the badge
             badge_recipients = []
@@ -7,9 +7,8 @@ import io
 from data.events import (
     get_event, get_events, get_active_events,
     add_participant, submit_entry, validate_catch_event_entry,
-    generate_pokemon_image, event_name_autocomplete, get_pokemon_names
+    get_event_image, event_name_autocomplete, get_pokemon_names
 )
-from data.badges import get_badge_id
 
 
 # Event type choices
@@ -129,10 +128,10 @@ async def event_info(interaction: discord.Interaction, event_name: str):
             inline=False
         )
         
-        # Generate image of Pokémon to catch
-        pokemon_image = await generate_pokemon_image(event.pokemon_list)
+        # Get the stored image of Pokémon to catch
+        pokemon_image = await get_event_image(interaction.guild_id, event)
         if pokemon_image:
-            file = discord.File(fp=pokemon_image, filename="pokemon_to_catch.png")
+            file = discord.File(fp=io.BytesIO(pokemon_image), filename="pokemon_to_catch.png")
             embed.set_image(url="attachment://pokemon_to_catch.png")
             await interaction.followup.send(embed=embed, file=file)
             return
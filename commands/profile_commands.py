@@ -1,24 +1,27 @@
 import discord
 from discord import app_commands
 import datetime
-from data.profiles import get_user_profile, get_user_badges, has_badge, check_special_badges, get_user_badge_names
-from data.badges import get_badge_id
+from data.profiles import get_profile_view, check_special_badges
 from typing import Optional
 
 @app_commands.allowed_installs(guilds=True, users=True)
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 async def profile_command(interaction: discord.Interaction, user: Optional[discord.User] = None):
     """View your profile or someone else's profile."""
+    # Badge checks and the profile query can take a moment, so acknowledge the interaction first
+    await interaction.response.defer()
+    
     # Determine which user's profile to show
     target_user = user or interaction.user
     
     # For the user's own profile, check for special badges first
     if target_user.id == interaction.user.id:
-        check_special_badges(target_user.id)
+        await check_special_badges(target_user.id)
     
-    # Get the user's badges
-    badges = get_user_badges(target_user.id)
-    badge_names = get_user_badge_names(target_user.id)
+    # Get the user's badges, with their emoji IDs
+    profile = await get_profile_view(target_user.id)
+    badges = profile["badges"]
+    badge_ids = {badge["name"]: badge["emoji_id"] for badge in badges}
     
     # Create the embed
     embed = discord.Embed(
@@ -41,10 +44,10 @@ async def profile_command(interaction: discord.Interaction, user: Optional[disco
     
     for badge_name in available_badges:
         # Determine if user has the badge
-        if badge_name in badge_names:
-            # User has badge - get the unlocked emoji ID
-            badge_id = get_badge_id(badge_name)
-            if badge_id != -1:
+        if badge_name in badge_ids:
+            # User has badge - use the unlocked emoji ID
+            badge_id = badge_ids[badge_name]
+            if badge_id is not None and badge_id != -1:
                 # Make sure the emoji name is lowercase and follows Discord's format
                 emoji_str = f"<:{badge_name}:{badge_id}>"
                 badge_display.append((badge_name, emoji_str, True))
@@ -97,7 +100,7 @@ async def profile_command(interaction: discord.Interaction, user: Optional[disco
             )
     
     # Send the profile
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 def setup(tree: app_commands.CommandTree):
     tree.command(
@@ -1,28 +1,34 @@
 import discord
 from discord import app_commands
+import asyncio
 import aiohttp # handle HTTP requests asynchronously
+from data.http_client import get_session
 
 async def random_quote_command(interaction: discord.Interaction): # Added type hint
     await interaction.response.defer()
 
-    async with aiohttp.ClientSession() as session:
-        # get the quote
-        quote_url = "https://zenquotes.io/api/random"
-        async with session.get(quote_url) as response:
+    # get the quote, through the shared session so it uses the same connection pool as every other request
+    quote_url = "https://zenquotes.io/api/random"
+    try:
+        async with get_session().get(quote_url) as response:
             if response.status != 200:
                 await interaction.followup.send("Sorry, I couldn't fetch a quote right now.")
                 return
             data = await response.json()
             quote = data[0]['q']
             author = data[0]['a']
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching quote: {e}")
+        await interaction.followup.send("Sorry, I couldn't fetch a quote right now.")
+        return
 
-        # get a random image for the thumbnail
-        image_url = "https://picsum.photos/300/200"
-        # We don't need to fetch the image data, just its final URL after redirects
-        # aiohttp handles redirects by default.
-        # For picsum, the direct URL is what we need.
-        
-        embed = quote_embed(quote, author, image_url) # Pass the direct URL
+    # get a random image for the thumbnail
+    image_url = "https://picsum.photos/300/200"
+    # We don't need to fetch the image data, just its final URL after redirects
+    # aiohttp handles redirects by default.
+    # For picsum, the direct URL is what we need.
+    
+    embed = quote_embed(quote, author, image_url) # Pass the direct URL
 
     await interaction.followup.send(embed=embed)
 
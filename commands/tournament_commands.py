@@ -6,17 +6,33 @@ from discord.ext.commands import has_permissions
 from data.tournament import (
     create_tournament, get_tournament, list_tournaments, delete_tournament,
     generate_bracket_image, Tournament, Participant, Match, tournament_name_autocomplete,
-    save_tournaments
+    save_tournaments, bracket_region_count, get_match_region, MAX_TOURNAMENT_SIZE, FULL_BRACKET_MAX_ROUNDS
 )
 
 # Create tournament group
 tournament_group = app_commands.Group(name="tournament", description="Commands for managing tournaments.")
 
+# Bracket view choices
+BRACKET_VIEW_CHOICES = [
+    app_commands.Choice(name="Overview", value="overview"),
+    app_commands.Choice(name="Region", value="region")
+]
+
+def join_field_lines(lines: List[str], limit: int = 1024) -> str:
+    """Join lines for an embed field, leaving out the lines that don't fit within Discord's field limit."""
+    value = ""
+    for i, line in enumerate(lines):
+        more = f"\n...and {len(lines) - i} more"
+        if len(value) + len(line) + 1 + len(more) > limit:
+            return value + more
+        value += ("\n" if value else "") + line
+    return value
+
 @tournament_group.command(name="create", description="Create a new tournament (Admin only)")
 @has_permissions(administrator=True)
 @app_commands.describe(
     name="Name of the tournament",
-    size="Maximum number of participants (2-64)"
+    size=f"Maximum number of participants (2-{MAX_TOURNAMENT_SIZE})"
 )
 async def tournament_create(interaction: discord.Interaction, name: str, size: int):
     await interaction.response.defer()
@@ -198,7 +214,7 @@ async def tournament_start(interaction: discord.Interaction, tournament_name: st
         return
     
     # Generate bracket image
-    bracket_image = await generate_bracket_image(tournament)
+    bracket_image = await generate_bracket_image(tournament, interaction.guild_id)
     
     # Create a message with tournament info
     embed = discord.Embed(
@@ -218,7 +234,7 @@ async def tournament_start(interaction: discord.Interaction, tournament_name: st
         
         embed.add_field(
             name="Current Matches",
-            value="\n".join(match_list),
+            value=join_field_lines(match_list),
             inline=False
         )
     
@@ -232,10 +248,18 @@ async def tournament_start(interaction: discord.Interaction, tournament_name: st
 @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
 @tournament_group.command(name="bracket", description="View the tournament bracket")
 @app_commands.describe(
-    tournament_name="Name of the tournament"
+    tournament_name="Name of the tournament",
+    view="Part of the bracket to show (large brackets show the overview by default)",
+    region="Region of the bracket to show, with avatars"
 )
+@app_commands.choices(view=BRACKET_VIEW_CHOICES)
 @app_commands.autocomplete(tournament_name=tournament_name_autocomplete)
-async def tournament_bracket(interaction: discord.Interaction, tournament_name: str):
+async def tournament_bracket(
+    interaction: discord.Interaction,
+    tournament_name: str,
+    view: Optional[app_commands.Choice[str]] = None,
+    region: Optional[int] = None
+):
     await interaction.response.defer()
     
     # Get the tournament
@@ -260,15 +284,21 @@ async def tournament_bracket(interaction: discord.Interaction, tournament_name:
             
             embed.add_field(
                 name="Registered Participants",
-                value="\n".join(participant_list) if participant_list else "None yet",
+                value=join_field_lines(participant_list) if participant_list else "None yet",
                 inline=False
             )
         
         await interaction.followup.send(embed=embed)
         return
     
+    # Check the region
+    region_count = bracket_region_count(tournament)
+    if region is not None and not 1 <= region <= region_count:
+        await interaction.followup.send(f"Region must be between 1 and {region_count}.", ephemeral=True)
+        return
+    
     # Generate bracket image
-    bracket_image = await generate_bracket_image(tournament)
+    bracket_image = await generate_bracket_image(tournament, interaction.guild_id, view.value if view else "auto", region)
     
     # Create a message with tournament info
     embed = discord.Embed(
@@ -276,6 +306,8 @@ async def tournament_bracket(interaction: discord.Interaction, tournament_name:
         description=f"Tournament status: {'Completed' if tournament.completed else 'In Progress'}",
         color=discord.Color.blue()
     )
+    if region_count > 1:
+        embed.set_footer(text=f"This bracket has {region_count} regions, use the region option to see one with avatars.")
     
     # List current matches
     current_matches = tournament.get_current_matches()
@@ -288,7 +320,7 @@ async def tournament_bracket(interaction: discord.Interaction, tournament_name:
         
         embed.add_field(
             name="Current Matches",
-            value="\n".join(match_list),
+            value=join_field_lines(match_list),
             inline=False
         )
     
@@ -411,8 +443,9 @@ async def tournament_match(interaction: discord.Interaction, tournament_name: st
     # Get the loser
     loser = match.participant1 if match.winner.user_id == match.participant2.user_id else match.participant2
     
-    # Generate bracket image
-    bracket_image = await generate_bracket_image(tournament)
+    # Generate bracket image, large brackets show the region of this match
+    region = get_match_region(tournament, match_id) if tournament.size > 2 ** FULL_BRACKET_MAX_ROUNDS else None
+    bracket_image = await generate_bracket_image(tournament, interaction.guild_id, region=region)
     
     # Create a message with match result
     embed = discord.Embed(
@@ -440,7 +473,7 @@ async def tournament_match(interaction: discord.Interaction, tournament_name: st
             
             embed.add_field(
                 name="Next Matches",
-                value="\n".join(match_list),
+                value=join_field_lines(match_list),
                 inline=False
             )
     
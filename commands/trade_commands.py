@@ -1,6 +1,6 @@
 import discord
 from discord import app_commands
-import aiohttp
+from data.pokedex import get_pokemon
 import asyncio
 from typing import Optional
 
@@ -14,19 +14,12 @@ from typing import Optional
 # }
 active_trades = {}
 
-POKEAPI_BASE_URL = "https://pokeapi.co/api/v2/"
-
-async def fetch_pokemon_data(session: aiohttp.ClientSession, pokemon_id: int):
-    """Fetch Pokemon data from PokeAPI."""
-    try:
-        async with session.get(f"{POKEAPI_BASE_URL}pokemon/{pokemon_id}") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                return None
-    except Exception as e:
-        print(f"Error fetching Pokemon data: {e}")
+async def fetch_pokemon_data(pokemon_id: int):
+    """Get Pokemon data from the Pokédex."""
+    data = await get_pokemon(pokemon_id)
+    if data is None or data == "error":
         return None
+    return data
 
 def generate_trade_id(user1_id: int, user2_id: int) -> str:
     """Generate a unique trade ID based on the users involved."""
@@ -133,16 +126,15 @@ async def trade_command(interaction: discord.Interaction, pokemon_code: str,
     }
     
     # Fetch Pokemon data to display
-    async with aiohttp.ClientSession() as session:
-        pokemon_data = await fetch_pokemon_data(session, pokemon_id)
+    pokemon_data = await fetch_pokemon_data(pokemon_id)
         
-        if not pokemon_data:
-            await interaction.followup.send("Could not fetch Pokemon data. Please try again later.", ephemeral=True)
-            del active_trades[trade_id]
-            return
+    if not pokemon_data:
+        await interaction.followup.send("Could not fetch Pokemon data. Please try again later.", ephemeral=True)
+        del active_trades[trade_id]
+        return
         
-        pokemon_name = pokemon_data['name'].capitalize()
-        pokemon_sprite = pokemon_data['sprites']['front_default']
+    pokemon_name = pokemon_data['name'].capitalize()
+    pokemon_sprite = pokemon_data['sprite']
     
     # Create the initial trade message
     embed = discord.Embed(
@@ -239,14 +231,13 @@ async def update_trade_messages(interaction: discord.Interaction, trade_id: str)
     recipient = await interaction.client.fetch_user(trade_info["recipient"]["user_id"])
     
     # Fetch Pokemon data for both users
-    async with aiohttp.ClientSession() as session:
-        initiator_pokemon_id = int(trade_info["initiator"]["pokemon_code"].split(',')[0].strip())
-        initiator_pokemon_data = await fetch_pokemon_data(session, initiator_pokemon_id)
+    initiator_pokemon_id = int(trade_info["initiator"]["pokemon_code"].split(',')[0].strip())
+    initiator_pokemon_data = await fetch_pokemon_data(initiator_pokemon_id)
         
-        recipient_pokemon_data = None
-        if trade_info["recipient"]["pokemon_code"]:
-            recipient_pokemon_id = int(trade_info["recipient"]["pokemon_code"].split(',')[0].strip())
-            recipient_pokemon_data = await fetch_pokemon_data(session, recipient_pokemon_id)
+    recipient_pokemon_data = None
+    if trade_info["recipient"]["pokemon_code"]:
+        recipient_pokemon_id = int(trade_info["recipient"]["pokemon_code"].split(',')[0].strip())
+        recipient_pokemon_data = await fetch_pokemon_data(recipient_pokemon_id)
     
     # Create the updated embed
     embed = discord.Embed(
@@ -258,7 +249,7 @@ async def update_trade_messages(interaction: discord.Interaction, trade_id: str)
     # Add initiator's Pokemon
     if initiator_pokemon_data:
         initiator_pokemon_name = initiator_pokemon_data['name'].capitalize()
-        initiator_pokemon_sprite = initiator_pokemon_data['sprites']['front_default']
+        initiator_pokemon_sprite = initiator_pokemon_data['sprite']
         initiator_pokemon_level = trade_info["initiator"]["pokemon_level"]
         
         embed.add_field(
@@ -273,7 +264,7 @@ async def update_trade_messages(interaction: discord.Interaction, trade_id: str)
     # Add recipient's Pokemon if available
     if recipient_pokemon_data:
         recipient_pokemon_name = recipient_pokemon_data['name'].capitalize()
-        recipient_pokemon_sprite = recipient_pokemon_data['sprites']['front_default']
+        recipient_pokemon_sprite = recipient_pokemon_data['sprite']
         recipient_pokemon_level = trade_info["recipient"]["pokemon_level"]
         
         embed.add_field(
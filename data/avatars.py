@@ -0,0 +1,68 @@
+import os
+import io
+import time
+import asyncio
+import aiohttp
+from typing import Dict, Iterable, Optional
+from PIL import Image
+from data.http_client import get_session
+from data.memory_cache import LRUCache
+from data.help_functions import gather_limited
+from data.renderer import render
+
+# How long a downloaded avatar is used before it is downloaded again, in seconds (default: 1 day)
+AVATAR_CACHE_TTL = int(os.getenv("AVATAR_CACHE_TTL", str(24 * 60 * 60)))
+
+# How long a failed download is remembered before it is tried again, in seconds (default: 5 minutes)
+AVATAR_FAILURE_TTL = int(os.getenv("AVATAR_FAILURE_TTL", str(5 * 60)))
+
+# Maximum number of avatars downloaded at the same time
+AVATAR_FETCH_CONCURRENCY = 64
+
+# Resized avatars by (URL, size)
+# Structure: {(avatar_url, size): (expires_at, PNG bytes, or None if the download failed)}
+avatar_cache = LRUCache(int(os.getenv("AVATAR_CACHE_SIZE", "1024")))
+
+def resize_avatar(image_data: bytes, size: int) -> bytes:
+    """Resize an avatar to a size by size RGBA PNG."""
+    avatar_img = Image.open(io.BytesIO(image_data)).convert('RGBA')
+    avatar_img = avatar_img.resize((size, size))
+    output = io.BytesIO()
+    avatar_img.save(output, format='PNG')
+    return output.getvalue()
+
+async def _download_avatar(url: str, size: int) -> Optional[bytes]:
+    """Download an avatar and resize it in the render pool."""
+    try:
+        async with get_session().get(url) as resp:
+            if resp.status != 200:
+                return None
+            image_data = await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error downloading avatar {url}: {e}")
+        return None
+
+    try:
+        return await render(resize_avatar, image_data, size)
+    except Exception as e:
+        print(f"Error resizing avatar {url}: {e}")
+        return None
+
+async def get_avatar(url: str, size: int) -> Optional[bytes]:
+    """Get an avatar resized to size by size pixels, as PNG bytes. Returns None if it couldn't be downloaded."""
+    key = (url, size)
+    cached = avatar_cache.get(key)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
+    image_data = await avatar_cache.coalesce(key, lambda: _download_avatar(url, size))
+    # Failures are cached too, so a deleted or unreachable avatar isn't requested again for every render
+    ttl = AVATAR_CACHE_TTL if image_data is not None else AVATAR_FAILURE_TTL
+    avatar_cache.set(key, (time.time() + ttl, image_data))
+    return image_data
+
+async def get_avatars(urls: Iterable[str], size: int) -> Dict[str, Optional[bytes]]:
+    """Get many avatars at once. Every unique URL is downloaded at most once, all in parallel."""
+    unique_urls = list(dict.fromkeys(urls))
+    results = await gather_limited(AVATAR_FETCH_CONCURRENCY, *(get_avatar(url, size) for url in unique_urls))
+    return dict(zip(unique_urls, results))
@@ -1,7 +1,7 @@
 import os
 from data.database import db
 
-def get_badge_id(badge_name: str) -> int:
+async def get_badge_id(badge_name: str) -> int:
     """
     Returns the badge ID for a given badge name from the database.
     
@@ -15,12 +15,12 @@ def get_badge_id(badge_name: str) -> int:
     if badge_name.endswith('_locked'):
         # Remove '_locked' suffix and get the locked emoji ID
         base_name = badge_name[:-7]
-        row = db.fetch_one("SELECT locked_emoji_id FROM badges WHERE name = ?", (base_name,))
+        row = await db.fetch_one("SELECT locked_emoji_id FROM badges WHERE name = ?", (base_name,))
         if row and row["locked_emoji_id"] != -1:
             return row["locked_emoji_id"]
     else:
         # For regular badges
-        row = db.fetch_one("SELECT emoji_id FROM badges WHERE name = ?", (badge_name,))
+        row = await db.fetch_one("SELECT emoji_id FROM badges WHERE name = ?", (badge_name,))
         if row and row["emoji_id"] != -1:
             return row["emoji_id"]
     
@@ -1,30 +1,102 @@
 import sqlite3
 import os
+import logging
+import asyncio
 import datetime
-from typing import List, Dict, Any, Optional, Tuple, Union
+import functools
+import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple, Union
 from dotenv import load_dotenv
 
 # Database file path
 DB_FILE = os.path.join(os.path.dirname(__file__), 'ankibot.db')
 load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Connection settings (can be tuned from the .env file)
+DB_CACHE_MB = int(os.getenv("DB_CACHE_MB", "16"))  # Page cache of the connection
+DB_MMAP_MB = int(os.getenv("DB_MMAP_MB", "64"))  # Part of the file read through memory mapping
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))  # Wait this long for a lock held by another process
+DB_CHECKPOINT_INTERVAL = int(os.getenv("DB_CHECKPOINT_INTERVAL", "300"))  # Seconds between WAL checkpoints
+
+# Schema changes on top of the tables created by setup_database, applied in order. Every database
+# remembers the last migration it ran in the schema_version table, so each one runs exactly once.
+# Only ever append to this list: migration N is the Nth entry.
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    ("Allow every badge only once per user", [
+        # Keep the first award of every badge that was awarded more than once
+        """DELETE FROM user_badges WHERE id NOT IN (
+               SELECT MIN(id) FROM user_badges GROUP BY user_id, badge_name
+           )""",
+        # Also serves lookups of all badges of a user
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_user_badges_user_badge ON user_badges(user_id, badge_name)",
+    ]),
+    ("Index event participants", [
+        "CREATE INDEX IF NOT EXISTS idx_event_participants_event_user ON event_participants(event_id, user_id)",
+    ]),
+]
+
+# Fixes for rows written while foreign keys weren't enforced, run when PRAGMA foreign_key_check finds any
+REFERENCE_REPAIRS: List[str] = [
+    # Register the users that have badges or joined events without a users row
+    """INSERT OR IGNORE INTO users (id, first_seen, created_at, updated_at)
+       SELECT user_id, MIN(date), MIN(date), MIN(date) FROM user_badges
+       WHERE user_id IS NOT NULL AND user_id NOT IN (SELECT id FROM users)
+       GROUP BY user_id""",
+    """INSERT OR IGNORE INTO users (id, first_seen, created_at, updated_at)
+       SELECT user_id, now, now, now
+       FROM event_participants, (SELECT strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime') AS now)
+       WHERE user_id IS NOT NULL AND user_id NOT IN (SELECT id FROM users)
+       GROUP BY user_id""",
+    # Rows of deleted events, which ON DELETE CASCADE would have removed
+    "DELETE FROM event_pokemon WHERE event_id NOT IN (SELECT id FROM events)",
+    "DELETE FROM event_participants WHERE event_id NOT IN (SELECT id FROM events)",
+]
+
 class DatabaseManager:
     """Manages database connections and operations"""
     
     def __init__(self):
         """Initialize the database connection and create tables if they don't exist"""
         self.conn = None
+        self.transaction_depth = 0
+        self.foreign_keys_checked = False
         self.setup_database()
     
     def get_connection(self):
         """Get a connection to the database"""
         if self.conn is None:
-            self.conn = sqlite3.connect(DB_FILE)
+            self.conn = sqlite3.connect(DB_FILE, timeout=DB_BUSY_TIMEOUT_MS / 1000)
             self.conn.row_factory = sqlite3.Row  # This allows access to columns by name
+            
+            # Write ahead logging lets a commit append to the log instead of syncing the database file,
+            # and with synchronous=NORMAL the log is only synced on checkpoints. A crash can lose the
+            # last commits, but never corrupts the database.
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(f"PRAGMA cache_size=-{DB_CACHE_MB * 1024}")
+            self.conn.execute(f"PRAGMA mmap_size={DB_MMAP_MB * 1024 * 1024}")
+            self.conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+            # Only enforced once setup_database has checked the existing rows
+            if self.foreign_keys_checked:
+                self.conn.execute("PRAGMA foreign_keys=ON")
         return self.conn
     
+    def checkpoint(self, mode: str = "PASSIVE"):
+        """Copy the write ahead log into the database file. TRUNCATE also empties the log file."""
+        if self.conn:
+            self.conn.execute(f"PRAGMA wal_checkpoint({mode})")
+    
     def close(self):
         """Close the database connection"""
         if self.conn:
+            try:
+                self.checkpoint("TRUNCATE")
+            except sqlite3.Error as e:
+                print(f"Error checkpointing the database: {e}")
             self.conn.close()
             self.conn = None
     
@@ -110,10 +182,71 @@ class DatabaseManager:
         )
         ''')
         
+        # Schema version table, one row per applied migration
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+        ''')
+        
+        conn.commit()
+        
+        # Bring the schema up to date
+        self._run_migrations()
+        
         # Initialize badges
         self._initialize_badges()
         
         conn.commit()
+        
+        # Enforce foreign keys from now on
+        self._check_foreign_keys()
+        self.foreign_keys_checked = True
+        conn.execute("PRAGMA foreign_keys=ON")
+    
+    def get_schema_version(self) -> int:
+        """Get the number of the last applied migration, 0 if none were applied"""
+        row = self.fetch_one("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return row[0]
+    
+    def _run_migrations(self):
+        """Apply the migrations the database doesn't have yet, each in its own transaction"""
+        current_version = self.get_schema_version()
+        for version, (description, statements) in enumerate(MIGRATIONS, start=1):
+            if version <= current_version:
+                continue
+            
+            print(f"Applying database migration {version}: {description}")
+            with self.transaction():
+                for statement in statements:
+                    self.execute(statement)
+                self.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.datetime.now().isoformat())
+                )
+    
+    def _check_foreign_keys(self):
+        """
+        Repair the rows that reference missing rows, which can't be changed once foreign keys are enforced.
+        
+        Rows that can't be repaired, like badges that no longer exist, are kept and logged.
+        """
+        if not self.fetch_all("PRAGMA foreign_key_check"):
+            return
+        
+        with self.transaction():
+            for statement in REFERENCE_REPAIRS:
+                self.execute(statement)
+        
+        violations: Dict[Tuple[str, str], int] = {}
+        for row in self.fetch_all("PRAGMA foreign_key_check"):
+            key = (row["table"], row["parent"])
+            violations[key] = violations.get(key, 0) + 1
+        
+        for (table, parent), count in violations.items():
+            logger.warning("%d rows in %s reference missing rows in %s", count, table, parent)
     
     def _initialize_badges(self):
         """Initialize badge data if the table is empty"""
@@ -225,26 +358,182 @@ class DatabaseManager:
             conn.commit()
             print(f"Successfully initialized {len(badges_data)} badge definitions")
     
-    def execute(self, query, params=None):
-        """Execute a query with optional parameters"""
+    def _query(self, query, params=None):
         conn = self.get_connection()
-        cursor = conn.cursor()
         if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        conn.commit()
+            return conn.execute(query, params)
+        return conn.execute(query)
+    
+    def execute(self, query, params=None):
+        """Execute a query with optional parameters, committed right away unless it is part of a transaction"""
+        return self._write(lambda: self._query(query, params))
+    
+    def executemany(self, query, params_list):
+        """Execute a query once for every set of parameters, committed together unless it is part of a transaction"""
+        return self._write(lambda: self.get_connection().executemany(query, params_list))
+    
+    def _write(self, run_query):
+        if self.transaction_depth:
+            return run_query()
+        try:
+            cursor = run_query()
+        except sqlite3.Error:
+            # sqlite3 opened a transaction for the failed statement, don't leave it open
+            self.conn.rollback()
+            raise
+        self.conn.commit()
         return cursor
     
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Run the statements in the with block as one transaction, committed at the end or rolled back on an error.
+        
+        A transaction inside a transaction becomes a savepoint: an error only rolls back its own
+        statements, and they are committed together with the outer transaction.
+        """
+        conn = self.get_connection()
+        depth = self.transaction_depth
+        if depth:
+            savepoint = f"sp{depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+        else:
+            conn.execute("BEGIN")
+        
+        self.transaction_depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            if depth:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
+            raise
+        else:
+            if depth:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
+        finally:
+            self.transaction_depth = depth
+    
     def fetch_one(self, query, params=None):
-        """Execute a query and fetch one result"""
-        cursor = self.execute(query, params)
-        return cursor.fetchone()
+        """Execute a query and fetch one result. Reads never commit."""
+        return self._query(query, params).fetchone()
     
     def fetch_all(self, query, params=None):
+        """Execute a query and fetch all results. Reads never commit."""
+        return self._query(query, params).fetchall()
+
+# Set while the current task is inside AsyncDatabase.transaction()
+_in_transaction = contextvars.ContextVar("in_transaction", default=False)
+
+class AsyncDatabase:
+    """
+    Async access to the database, for use from commands.
+    
+    Every query runs on a single dedicated database thread that owns the connection, so a slow
+    disk only delays the commands waiting for their query instead of the whole event loop.
+    Queries are executed one at a time, and a transaction keeps other queries out until it ends.
+    """
+    
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="database")
+        # Create the connection on the database thread, the only thread that uses it
+        self.manager: DatabaseManager = self._executor.submit(DatabaseManager).result()
+        self._lock: Optional[asyncio.Lock] = None
+        self._checkpoint_task: Optional[asyncio.Task] = None
+    
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a function on the database thread. Results must not hold on to cursors, they can't leave the thread."""
+        if _in_transaction.get():
+            # The transaction of this task already holds the lock
+            return await self._run_on_thread(func, *args)
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            return await self._run_on_thread(func, *args)
+    
+    async def _run_on_thread(self, func: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+    
+    async def fetch_one(self, query: str, params=None) -> Optional[sqlite3.Row]:
+        """Execute a query and fetch one result"""
+        return await self.run(self.manager.fetch_one, query, params)
+    
+    async def fetch_all(self, query: str, params=None) -> List[sqlite3.Row]:
         """Execute a query and fetch all results"""
-        cursor = self.execute(query, params)
-        return cursor.fetchall()
+        return await self.run(self.manager.fetch_all, query, params)
+    
+    async def execute(self, query: str, params=None) -> int:
+        """Execute a query with optional parameters, returns the number of changed rows"""
+        return await self.run(lambda: self.manager.execute(query, params).rowcount)
+    
+    async def executemany(self, query: str, params_list: Iterable) -> int:
+        """Execute a query once for every set of parameters, returns the number of changed rows"""
+        return await self.run(lambda: self.manager.executemany(query, params_list).rowcount)
+    
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """
+        Run the queries in the async with block as one transaction.
+        
+        It is committed when the block ends and rolled back if it raises. Other tasks wait until then.
+        A transaction inside a transaction becomes a savepoint, see DatabaseManager.transaction.
+        """
+        if _in_transaction.get():
+            # The outer transaction of this task already holds the lock
+            async with self._transaction_on_thread():
+                yield self
+            return
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            token = _in_transaction.set(True)
+            try:
+                async with self._transaction_on_thread():
+                    yield self
+            finally:
+                _in_transaction.reset(token)
+    
+    @contextlib.asynccontextmanager
+    async def _transaction_on_thread(self):
+        transaction = self.manager.transaction()
+        await self._run_on_thread(transaction.__enter__)
+        try:
+            yield
+        except BaseException as e:
+            await self._run_on_thread(transaction.__exit__, type(e), e, e.__traceback__)
+            raise
+        else:
+            await self._run_on_thread(transaction.__exit__, None, None, None)
+    
+    def start_checkpoints(self):
+        """Start checkpointing the write ahead log every DB_CHECKPOINT_INTERVAL seconds. Called on startup by bot.py."""
+        if self._checkpoint_task is None:
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+    
+    async def _checkpoint_loop(self):
+        # SQLite also checkpoints once the log reaches 1000 pages, but only on a commit. This keeps
+        # the log short when the bot is mostly reading, which keeps reads fast.
+        while True:
+            await asyncio.sleep(DB_CHECKPOINT_INTERVAL)
+            try:
+                await self.run(self.manager.checkpoint)
+            except sqlite3.Error as e:
+                print(f"Error checkpointing the database: {e}")
+    
+    async def close(self):
+        """Checkpoint and close the connection, then stop the database thread. Called on shutdown by bot.py."""
+        if self._checkpoint_task is not None:
+            self._checkpoint_task.cancel()
+            self._checkpoint_task = None
+        await self.run(self.manager.close)
+        self._executor.shutdown(wait=True)
 
-# Initialize the database manager
-db = DatabaseManager()
+# Initialize the database
+db = AsyncDatabase()
@@ -1,16 +1,33 @@
 import discord
 import json
 import os
+import glob
+import hashlib
 import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import io
-import aiohttp
-from PIL import Image, ImageDraw, ImageFont
+from data.sprites import get_sprite, read_file, write_file
+from data.renderer import render
+from data.render_resources import get_font, get_canvas
+from data.memory_cache import LRUCache
+from data.help_functions import gather_limited
+from data.pokedex import get_pokemon
+from PIL import Image, ImageDraw
 import asyncio
 
 # Path for event data file
 EVENT_DATA_FILE = os.path.join(os.path.dirname(__file__), 'event_data.json')
 
+# Directory for rendered "Pokémon to Catch" images, stored as event_images/<guild_id>/<event>-<list hash>.png
+EVENT_IMAGE_DIR = os.path.join(os.path.dirname(__file__), 'event_images')
+
+# Maximum number of sprites downloaded at the same time for an event image
+SPRITE_FETCH_CONCURRENCY = 10
+
+# Rendered event images by Pokémon list
+# Structure: {(pokemon_id, ...): PNG bytes}
+event_image_cache = LRUCache(max_entries=64)
+
 # Dictionary to store active events by guild ID
 # Structure: {guild_id: {event_name: EventData}}
 active_events = {}
@@ -150,6 +167,7 @@ def delete_event(guild_id: int, event_name: str) -> bool:
         return False
     
     del active_events[guild_id][event_name]
+    invalidate_event_image(guild_id, event_name)
     
     # Clean up if guild has no events
     if not active_events[guild_id]:
@@ -191,6 +209,7 @@ def set_pokemon_list(guild_id: int, event_name: str, pokemon_list: List[int]) ->
         return False
     
     event.pokemon_list = pokemon_list
+    invalidate_event_image(guild_id, event_name)
     save_events()
     return True
 
@@ -281,11 +300,73 @@ async def validate_catch_event_entry(entry_data: Any, pokemon_list: List[int]) -
     
     return success, message, validation_results
 
-async def generate_pokemon_image(pokemon_ids: List[int]) -> Optional[io.BytesIO]:
-    """Generate an image showing all Pokémon required for the event."""
-    if not pokemon_ids:
+async def _fetch_event_sprite(pokemon_id: int) -> Optional[bytes]:
+    """Fetch a sprite for the event image, None if it couldn't be fetched."""
+    try:
+        return await get_sprite(pokemon_id)
+    except Exception as e:
+        print(f"Error fetching sprite for Pokémon #{pokemon_id}: {e}")
+        return None
+
+async def _render_pokemon_image(pokemon_ids: List[int]) -> Tuple[bytes, bool]:
+    """Render the image of a Pokémon list, returns the PNG bytes and whether all sprites could be fetched."""
+    # The same Pokémon list always gives the same image
+    key = tuple(pokemon_ids)
+    image_data = event_image_cache.get(key)
+    if image_data is not None:
+        return image_data, True
+    
+    # Fetch all Pokémon sprites at once
+    sprites = await gather_limited(SPRITE_FETCH_CONCURRENCY, *(_fetch_event_sprite(pokemon_id) for pokemon_id in pokemon_ids))
+    
+    # Draw the image in the render pool
+    image_data = await render(draw_pokemon_image, pokemon_ids, sprites)
+    
+    # Don't keep images with placeholders around, the missing sprites may work next time
+    complete = all(sprite is not None for sprite in sprites)
+    if complete:
+        event_image_cache.set(key, image_data)
+    return image_data, complete
+
+def _event_image_prefix(guild_id: int, event_name: str) -> str:
+    # Event names can contain anything, so files are named after a hash of the name
+    event_key = hashlib.sha256(event_name.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(EVENT_IMAGE_DIR, str(guild_id), event_key)
+
+def event_image_path(guild_id: int, event_name: str, pokemon_list: List[int]) -> str:
+    """Get the path the image of an event is stored at, for its current Pokémon list."""
+    list_hash = hashlib.sha256(json.dumps(pokemon_list).encode('utf-8')).hexdigest()[:16]
+    return f"{_event_image_prefix(guild_id, event_name)}-{list_hash}.png"
+
+def invalidate_event_image(guild_id: int, event_name: str):
+    """Remove the stored images of an event."""
+    for path in glob.glob(f"{glob.escape(_event_image_prefix(guild_id, event_name))}-*.png"):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Error removing event image {path}: {e}")
+
+async def get_event_image(guild_id: int, event: EventData) -> Optional[bytes]:
+    """
+    Get the "Pokémon to Catch" image of an event as PNG bytes.
+
+    The image is stored next to the event data and only rendered again when the Pokémon list changes.
+    """
+    if not event.pokemon_list:
         return None
     
+    path = event_image_path(guild_id, event.name, event.pokemon_list)
+    image_data = await asyncio.to_thread(read_file, path)
+    if image_data is not None:
+        return image_data
+    
+    image_data, complete = await _render_pokemon_image(event.pokemon_list)
+    if complete:
+        await asyncio.to_thread(write_file, path, image_data)
+    return image_data
+
+def draw_pokemon_image(pokemon_ids: List[int], sprites: List[Optional[bytes]]) -> bytes:
+    """Draw the event Pokémon grid from already fetched sprites, returns the PNG bytes."""
     # Constants for image generation
     POKEMON_PER_ROW = 5
     CELL_SIZE = 150
@@ -298,58 +379,50 @@ async def generate_pokemon_image(pokemon_ids: List[int]) -> Optional[io.BytesIO]
     img_height = rows * CELL_SIZE + PADDING * 2 + TITLE_HEIGHT
     
     # Create base image
-    image = Image.new('RGBA', (img_width, img_height), (255, 255, 255, 255))
+    image = get_canvas('RGBA', (img_width, img_height), (255, 255, 255, 255))
     draw = ImageDraw.Draw(image)
     
-    # Try to load fonts
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 24)
-        number_font = ImageFont.truetype("arial.ttf", 14)
-    except IOError:
-        # Fallback to default font
-        title_font = ImageFont.load_default()
-        number_font = ImageFont.load_default()
+    # Fonts are loaded once and shared by all renders
+    title_font = get_font(24)
+    number_font = get_font(14)
     
     # Draw title
     title = f"Pokémon to Catch: {len(pokemon_ids)}"
     draw.text((PADDING, PADDING), title, fill=(0, 0, 0), font=title_font)
     
-    # Fetch and draw Pokémon sprites
-    async with aiohttp.ClientSession() as session:
-        for i, pokemon_id in enumerate(pokemon_ids):
-            row = i // POKEMON_PER_ROW
-            col = i % POKEMON_PER_ROW
+    # Draw Pokémon sprites
+    for i, (pokemon_id, sprite_data) in enumerate(zip(pokemon_ids, sprites)):
+        row = i // POKEMON_PER_ROW
+        col = i % POKEMON_PER_ROW
             
-            x = PADDING + col * CELL_SIZE
-            y = PADDING + TITLE_HEIGHT + row * CELL_SIZE
+        x = PADDING + col * CELL_SIZE
+        y = PADDING + TITLE_HEIGHT + row * CELL_SIZE
             
-            # Draw Pokémon number
-            draw.text((x + 5, y + 5), f"#{pokemon_id}", fill=(100, 100, 100), font=number_font)
+        # Draw Pokémon number
+        draw.text((x + 5, y + 5), f"#{pokemon_id}", fill=(100, 100, 100), font=number_font)
             
-            # Fetch Pokémon sprite
+        sprite = None
+        if sprite_data is not None:
             try:
-                async with session.get(f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png") as resp:
-                    if resp.status == 200:
-                        sprite_data = await resp.read()
-                        sprite = Image.open(io.BytesIO(sprite_data)).convert('RGBA')
-                        
-                        # Center the sprite in the cell
-                        sprite_x = x + (CELL_SIZE - sprite.width) // 2
-                        sprite_y = y + (CELL_SIZE - sprite.height) // 2
-                        
-                        image.paste(sprite, (sprite_x, sprite_y), sprite)
+                sprite = Image.open(io.BytesIO(sprite_data)).convert('RGBA')
             except Exception as e:
-                print(f"Error fetching sprite for Pokémon #{pokemon_id}: {e}")
-                # Draw placeholder
-                draw.rectangle([(x + 20, y + 20), (x + CELL_SIZE - 20, y + CELL_SIZE - 20)], outline=(200, 200, 200))
-                draw.text((x + 35, y + 50), f"#{pokemon_id}", fill=(150, 150, 150), font=title_font)
+                print(f"Error reading sprite for Pokémon #{pokemon_id}: {e}")
+
+        if sprite is not None:
+            # Center the sprite in the cell
+            sprite_x = x + (CELL_SIZE - sprite.width) // 2
+            sprite_y = y + (CELL_SIZE - sprite.height) // 2
+                
+            image.paste(sprite, (sprite_x, sprite_y), sprite)
+        else:
+            # Draw placeholder
+            draw.rectangle([(x + 20, y + 20), (x + CELL_SIZE - 20, y + CELL_SIZE - 20)], outline=(200, 200, 200))
+            draw.text((x + 35, y + 50), f"#{pokemon_id}", fill=(150, 150, 150), font=title_font)
     
-    # Save image to BytesIO
+    # Save image to PNG bytes
     output = io.BytesIO()
     image.save(output, format='PNG')
-    output.seek(0)
-    
-    return output
+    return output.getvalue()
 
 # Event autocomplete
 async def event_name_autocomplete(interaction: discord.Interaction, current: str):
@@ -365,21 +438,16 @@ async def event_name_autocomplete(interaction: discord.Interaction, current: str
         for name in events if current.lower() in name.lower()
     ][:25]  # Discord limits to 25 choices
 
-# Helper function to get Pokemon names from API
+# Helper function to get Pokemon names from the Pokédex
 async def get_pokemon_names(pokemon_ids: List[int]) -> Dict[int, str]:
-    """Get Pokemon names from the PokeAPI."""
+    """Get Pokemon names from the Pokédex, falling back to PokeAPI for unknown IDs."""
     names = {}
-    async with aiohttp.ClientSession() as session:
-        for pokemon_id in pokemon_ids:
-            try:
-                async with session.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}") as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        names[pokemon_id] = data['name'].capitalize()
-                    else:
-                        names[pokemon_id] = f"Pokémon #{pokemon_id}"
-            except Exception:
-                names[pokemon_id] = f"Pokémon #{pokemon_id}"
+    for pokemon_id in pokemon_ids:
+        data = await get_pokemon(pokemon_id)
+        if data and data != "error":
+            names[pokemon_id] = data['name'].capitalize()
+        else:
+            names[pokemon_id] = f"Pokémon #{pokemon_id}"
     return names
 
 def set_badge_reward(guild_id: int, event_name: str, badge_name: str, required_completion: int) -> bool:
@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional
+
+class EvolutionChain:
+    """
+    Compact adjacency index of one evolution chain.
+
+    Built once per chain from the flattened [species, evolves_from, details] stages of the Pokédex,
+    and shared by every species in the chain. Branched chains (Eevee, Wurmple, ...) keep all branches.
+    """
+
+    def __init__(self, chain_id: int, stages: List[List[Optional[str]]]):
+        self.chain_id = chain_id
+        self.root: Optional[str] = None
+        self.parents: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.details: Dict[str, str] = {}
+
+        for species_name, evolves_from, evo_details in stages:
+            self.parents[species_name] = evolves_from
+            self.children.setdefault(species_name, [])
+            self.details[species_name] = evo_details or ""
+            if evolves_from is None:
+                self.root = species_name
+            else:
+                # Stages are stored parent first, so the parent is always known here
+                self.children[evolves_from].append(species_name)
+
+    @property
+    def members(self) -> List[str]:
+        """All species in the chain, parents before their evolutions."""
+        return list(self.parents.keys())
+
+    def is_branched(self) -> bool:
+        """Whether any species in the chain can evolve in more than one way."""
+        return any(len(children) > 1 for children in self.children.values())
+
+    def pre_evolutions(self, species_name: str) -> List[str]:
+        """Get the species a Pokémon evolves from, starting at the base form."""
+        line = []
+        parent = self.parents.get(species_name)
+        while parent is not None:
+            line.append(parent)
+            parent = self.parents.get(parent)
+        line.reverse()
+        return line
+
+    def next_stages(self, species_name: str) -> List[str]:
+        """Get the species a Pokémon can directly evolve into."""
+        return list(self.children.get(species_name, []))
+
+    def branches(self) -> List[List[str]]:
+        """Get every evolution path of the chain, from the base form to a final evolution."""
+        if self.root is None:
+            return []
+        paths: List[List[str]] = []
+        pending = [[self.root]]
+        while pending:
+            path = pending.pop()
+            children = self.children[path[-1]]
+            if not children:
+                paths.append(path)
+            # Pushed in reverse so the paths come out in the order of the chain
+            pending.extend(path + [child] for child in reversed(children))
+        return paths
+
+    def line_text(self, highlight: Optional[str] = None) -> str:
+        """
+        Get the full evolution line as text, e.g. "Charmander → Charmeleon (Level 16) → Charizard (Level 36)".
+        Every branch is shown as its own line: "Wurmple → Silcoon → Beautifly | Wurmple → Cascoon → Dustox".
+        """
+        def format_species(species_name: str) -> str:
+            text = f"{species_name.capitalize()}{self.details[species_name]}"
+            if species_name == highlight:
+                text = f"**{text}**"
+            return text
+
+        return " | ".join(
+            " → ".join(format_species(species_name) for species_name in path)
+            for path in self.branches()
+        )
+
+# Indexed chains by chain ID
+indexed_chains: Dict[int, EvolutionChain] = {}
+
+# Indexed chains by the name of every species in them
+species_chains: Dict[str, EvolutionChain] = {}
+
+def index_chain(chain_id: int, stages: List[List[Optional[str]]]) -> EvolutionChain:
+    """Index an evolution chain, or get it if it has already been indexed."""
+    chain = indexed_chains.get(chain_id)
+    if chain is None:
+        chain = EvolutionChain(chain_id, stages)
+        indexed_chains[chain_id] = chain
+        for species_name in chain.members:
+            species_chains[species_name] = chain
+    return chain
+
+def get_indexed_chain(chain_id: int) -> Optional[EvolutionChain]:
+    """Get an already indexed evolution chain by ID."""
+    return indexed_chains.get(chain_id)
+
+def get_species_chain(species_name: str) -> Optional[EvolutionChain]:
+    """Get the already indexed evolution chain a species belongs to."""
+    return species_chains.get(species_name.lower())
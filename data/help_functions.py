@@ -1,23 +1,79 @@
+import os
+import json
 import aiohttp
 import asyncio
+from typing import Any, Awaitable, List, Tuple
+from data.pokeapi_cache import pokeapi_cache
+from data.memory_cache import LRUCache
+
+# Hot responses are kept in memory, in front of the on-disk cache, bounded by the length of their JSON.
+# Parsed into Python objects a response takes several times that, so keep the limit modest.
+# Structure: {url: (response, length of its JSON)}
+pokeapi_memory_cache = LRUCache(
+    int(os.getenv("POKEAPI_MEMORY_CACHE_SIZE", "2048")),
+    max_bytes=int(os.getenv("POKEAPI_MEMORY_CACHE_MB", "32")) * 1024 * 1024,
+    sizeof=lambda entry: entry[1]
+)
+
+async def fetch_data(session: aiohttp.ClientSession, url: str, cache_in_memory: bool = True):
+    """
+    Helper function to fetch data from a URL.
+    Responses are cached in memory and on disk, and concurrent requests for the same URL are merged into one.
+
+    Bulk jobs that read every response once, like the Pokédex build, pass cache_in_memory=False so
+    they only go through the disk cache instead of pushing the hot responses out of memory.
+    """
+    cached = pokeapi_memory_cache.get(url)
+    if cached is not None:
+        return cached[0]
+
+    data, size = await pokeapi_memory_cache.coalesce(url, lambda: _fetch_uncached(session, url))
+    if cache_in_memory and data is not None and data != "error":
+        pokeapi_memory_cache.set(url, (data, size))
+    return data
+
+async def _fetch_uncached(session: aiohttp.ClientSession, url: str) -> Tuple[Any, int]:
+    """
+    Fetch data from the on-disk cache, or from the network if it isn't cached.
+    Returns the data and the length of its JSON.
+    """
+    cached = await pokeapi_cache.get(url)
+    if cached is not None:
+        return cached
 
-async def fetch_data(session: aiohttp.ClientSession, url: str):
-    """Helper function to fetch data from a URL."""
     try:
         async with session.get(url) as response:
             if response.status == 200:
-                return await response.json()
+                body = await response.read()
+                data = json.loads(body)
+                await pokeapi_cache.set(url, data)
+                return data, len(body)
             elif response.status == 404:
-                return None # Not found
+                return None, 0 # Not found
             else:
                 # Log or handle other HTTP errors if necessary
                 print(f"Error fetching {url}: Status {response.status}")
-                return "error" # Generic error indicator
     except aiohttp.ClientError as e:
         print(f"AIOHTTP client error fetching {url}: {e}")
-        return "error"
     except asyncio.TimeoutError:
         print(f"Timeout error fetching {url}")
-        return "error"
-    
+    except ValueError as e:
+        print(f"Invalid JSON from {url}: {e}")
+
+    # PokeAPI is down or rate limiting us, serve an expired entry if we have one
+    stale = await pokeapi_cache.get(url, allow_stale=True)
+    if stale is not None:
+        return stale
+    return "error", 0 # Generic error indicator
+
+async def gather_limited(limit: int, *aws: Awaitable[Any]) -> List[Any]:
+    """Run awaitables concurrently like asyncio.gather, but with at most `limit` running at the same time."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
 POKEAPI_BASE_URL = "https://pokeapi.co/api/v2/"
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import aiohttp
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connection pool settings (can be tuned from the .env file)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))  # Total open connections
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "20"))  # Open connections per host (pokeapi.co, github raw, ...)
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))  # How long idle connections stay open
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("HTTP_DNS_CACHE_SECONDS", "600"))  # How long resolved hosts are cached
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))  # Total timeout for a single request
+
+# The shared session, created on startup by bot.py
+_session: Optional[aiohttp.ClientSession] = None
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a session with a bounded keep-alive pool and DNS caching."""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_SIZE,
+        limit_per_host=HTTP_POOL_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        use_dns_cache=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+    )
+
+async def start_http_session() -> aiohttp.ClientSession:
+    """Create the shared HTTP session. Called once on startup by bot.py."""
+    return get_session()
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session.
+
+    All outgoing requests (PokeAPI, sprites, avatars) should go through this session,
+    so connections are kept alive and reused instead of doing a new TCP+TLS handshake per command.
+    """
+    global _session
+    if _session is None or _session.closed:
+        # Also created lazily, for scripts or requests made before startup finished
+        _session = _create_session()
+    return _session
+
+async def close_http_session():
+    """Close the shared HTTP session and all pooled connections."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,113 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class LRUCache:
+    """
+    Bounded in-memory least-recently-used cache with request coalescing.
+
+    Besides plain get/set, coalesce() makes sure that concurrent callers asking for the same key
+    share one in-flight fetch instead of each starting their own.
+
+    The cache can also be bounded by size: with max_bytes set, entries are evicted until the total
+    sizeof() of all values fits.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.size = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value and mark it as recently used. Returns None on a miss."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if the cache is full."""
+        self.pop(key)
+        if self.max_bytes is not None:
+            value_size = self._sizeof(value)
+            if value_size > self.max_bytes:
+                return  # Would evict everything else and still not fit
+            self.size += value_size
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            if self.max_bytes is not None:
+                self.size -= self._sizeof(evicted)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove a value from the cache."""
+        value = self._entries.pop(key, None)
+        if value is not None and self.max_bytes is not None:
+            self.size -= self._sizeof(value)
+        return value
+
+    def clear(self):
+        """Remove all values from the cache."""
+        self._entries.clear()
+        self.size = 0
+
+    async def coalesce(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fetch() for a key, unless a fetch for that key is already running.
+
+        Callers arriving while a fetch is in flight wait for its result instead of fetching again.
+        The result is not stored, the caller decides whether it is worth caching.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield so a cancelled waiter doesn't cancel the fetch for everyone else
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved, in case nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit/miss counters of this cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
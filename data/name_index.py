@@ -0,0 +1,264 @@
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+import discord
+from discord import app_commands
+
+# Sorted list of (search key, canonical Pokémon name), used for prefix searches
+_sorted_keys: List[Tuple[str, str]] = []
+
+# Lookup from every known name and alias to the canonical PokeAPI Pokémon name
+_lookup: Dict[str, str] = {}
+
+# Lookup from canonical Pokémon name to National Pokédex ID
+_ids: Dict[str, int] = {}
+
+# Lookup from National Pokédex ID to canonical Pokémon name
+_names_by_id: Dict[int, str] = {}
+
+# Trigram index for "did you mean" suggestions: trigram -> (number of trigrams, canonical name) of the names
+# containing it, sorted so the names closest in length to a query are found by bisection. Also the trigrams
+# of every name. Built lazily on the first suggestion, then kept up to date by add_name.
+_trigrams: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+_name_trigrams: Dict[str, FrozenSet[str]] = {}
+_trigrams_built = False
+
+# Minimum similarity (0-1) for a name to be suggested
+MIN_SIMILARITY = 0.3
+
+# Number of rarest query trigrams that candidate names are taken from. A single typo changes at most
+# four trigrams, so the right name always shares at least one of them.
+CANDIDATE_TRIGRAMS = 5
+
+# Maximum number of candidate names taken from each of those trigrams, a third from each of the sizes around
+# the query's. Together they bound the number of names scored per suggestion, however many forms the index holds.
+MAX_CANDIDATES_PER_TRIGRAM = 21
+
+# PokeAPI gives alternate forms IDs from here on, lower IDs are the default forms of species and share their ID
+FIRST_FORM_ID = 10001
+
+# Whether the index contains every Pokémon and form, so unknown names can be rejected without a request
+index_complete = False
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a Pokémon name the way PokeAPI spells them.
+    e.g. "Mr. Mime" -> "mr-mime", "Farfetch'd" -> "farfetchd", "Nidoran♀" -> "nidoran-f", "Flabébé" -> "flabebe"
+    """
+    name = name.strip().lower().replace('♀', '-f').replace('♂', '-m')
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    name = re.sub(r"['.:]", '', name)
+    name = re.sub(r'[^a-z0-9]+', '-', name)
+    return name.strip('-')
+
+def _aliases(name: str, species_name: Optional[str] = None) -> List[str]:
+    """Get the search keys of a Pokémon: its name, its name without dashes and its species name."""
+    keys = [name, name.replace('-', '')]
+    if species_name and species_name != name:
+        keys += [species_name, species_name.replace('-', '')]
+    return keys
+
+def _set_key(key: str, name: str):
+    """Point a search key at a Pokémon. Existing keys are only replaced by an exact name match."""
+    old_name = _lookup.get(key)
+    if old_name == name or (old_name is not None and key != name):
+        return
+    if old_name is not None:
+        del _sorted_keys[bisect.bisect_left(_sorted_keys, (key, old_name))]
+    bisect.insort(_sorted_keys, (key, name))
+    _lookup[key] = name
+
+def add_name(name: str, pokemon_id: int, species_name: Optional[str] = None):
+    """Add a Pokémon or form to the index."""
+    _ids[name] = pokemon_id
+    _names_by_id[pokemon_id] = name
+    for key in _aliases(name, species_name):
+        _set_key(key, name)
+    if _trigrams_built:
+        _add_trigrams(name)
+
+def build_index(names: Dict[str, int], species: Dict[str, str], complete: bool):
+    """
+    Build the index in one go.
+
+    Args:
+        names: canonical Pokémon name -> National Pokédex ID, for all Pokémon and forms
+        species: canonical Pokémon name -> species name, for the default forms
+        complete: whether names covers every Pokémon on PokeAPI
+    """
+    global index_complete, _trigrams_built
+    _sorted_keys.clear()
+    _lookup.clear()
+    _ids.clear()
+    _names_by_id.clear()
+    _trigrams.clear()
+    _name_trigrams.clear()
+    _trigrams_built = False
+
+    # Real names first, so they always win over species aliases
+    for name, pokemon_id in names.items():
+        _ids[name] = pokemon_id
+        _names_by_id[pokemon_id] = name
+        for key in _aliases(name):
+            _lookup.setdefault(key, name)
+    for name, species_name in species.items():
+        for key in _aliases(species_name):
+            _lookup.setdefault(key, name)
+
+    _sorted_keys.extend(sorted(_lookup.items()))
+    index_complete = complete
+
+def resolve(query: Union[str, int]) -> Optional[Union[str, int]]:
+    """
+    Resolve a user supplied Pokémon name or ID to what PokeAPI expects, without any request.
+
+    Returns None if the index is complete and no such Pokémon exists. If the index is incomplete,
+    unknown names are returned normalized so they can still be looked up on PokeAPI.
+    """
+    query = str(query).strip()
+    if query.lstrip('#').isdigit():
+        return int(query.lstrip('#'))
+
+    key = normalize_name(query)
+    name = _lookup.get(key) or _lookup.get(key.replace('-', ''))
+    if name is not None:
+        return name
+    if index_complete or not key:
+        return None
+    return key
+
+def get_id(name: str) -> Optional[int]:
+    """Get the National Pokédex ID of a canonical Pokémon name."""
+    return _ids.get(name)
+
+def get_species_id(query: Union[str, int]) -> Optional[int]:
+    """
+    Get the species ID of a resolved query, if the index knows it is the default form of a species.
+    Returns None for alternate forms and for names the index doesn't know.
+    """
+    pokemon_id = query if isinstance(query, int) else _ids.get(query)
+    if pokemon_id is None or not 0 < pokemon_id < FIRST_FORM_ID:
+        return None
+    return pokemon_id
+
+def search_prefix(prefix: str, limit: int = 25) -> List[str]:
+    """Get up to `limit` canonical Pokémon names that have a name or alias starting with the prefix."""
+    key = normalize_name(prefix)
+    results = []
+    i = bisect.bisect_left(_sorted_keys, (key, ''))
+    while i < len(_sorted_keys) and len(results) < limit:
+        search_key, name = _sorted_keys[i]
+        if not search_key.startswith(key):
+            break
+        if name not in results:
+            results.append(name)
+        i += 1
+    return results
+
+def get_trigrams(name: str) -> FrozenSet[str]:
+    """Get the set of character trigrams of a name, padded so the start and end of the name count more."""
+    padded = f"  {normalize_name(name).replace('-', '')} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def _dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+def _add_trigrams(name: str):
+    if name in _name_trigrams:
+        return
+    trigrams = get_trigrams(name)
+    _name_trigrams[name] = trigrams
+    for trigram in trigrams:
+        bisect.insort(_trigrams[trigram], (len(trigrams), name))
+
+def _build_trigrams():
+    """Build the trigram index over all canonical names."""
+    global _trigrams_built
+    for name in _ids:
+        trigrams = get_trigrams(name)
+        _name_trigrams[name] = trigrams
+        for trigram in trigrams:
+            _trigrams[trigram].append((len(trigrams), name))
+    for posting in _trigrams.values():
+        posting.sort()
+    _trigrams_built = True
+
+def similarity(a: str, b: str) -> float:
+    """Trigram similarity (Dice coefficient) of two names, from 0 (nothing in common) to 1 (the same)."""
+    return _dice(get_trigrams(a), get_trigrams(b))
+
+def get_candidates(query: str) -> Set[str]:
+    """
+    Get the names worth scoring for a query: at most MAX_CANDIDATES_PER_TRIGRAM names from each of the
+    query's CANDIDATE_TRIGRAMS rarest trigrams, taken from the names of about the query's length.
+
+    Finding them is a few bisections and slices of fixed size, so it costs the same for any number of names.
+    """
+    if not _trigrams_built:
+        _build_trigrams()
+    return _candidates(normalize_name(query), get_trigrams(query))
+
+def _candidates(query: str, query_trigrams: FrozenSet[str]) -> Set[str]:
+    size = len(query_trigrams)
+    # The rarest trigrams, the length of a posting is its number of names
+    postings = heapq.nsmallest(
+        CANDIDATE_TRIGRAMS, (_trigrams[t] for t in query_trigrams if t in _trigrams), key=len
+    )
+    # A typo usually changes the number of trigrams by at most one. Within each of those sizes, names are
+    # taken around the spot the query would be sorted at, so names spelled like the query come first.
+    window = MAX_CANDIDATES_PER_TRIGRAM // 3
+    candidates: Set[str] = set()
+    for posting in postings:
+        if len(posting) <= MAX_CANDIDATES_PER_TRIGRAM:
+            candidates.update(name for _, name in posting)
+            continue
+        for name_size in (size - 1, size, size + 1):
+            i = bisect.bisect_left(posting, (name_size, query))
+            start = max(0, i - window // 2)
+            candidates.update(name for s, name in posting[start:start + window] if s == name_size)
+    return candidates
+
+def suggest(query: str, k: int = 3, min_similarity: float = MIN_SIMILARITY) -> List[str]:
+    """
+    Get the k canonical Pokémon names closest to a (misspelled) query.
+
+    Only the names from get_candidates are scored, so a suggestion never scores more than
+    CANDIDATE_TRIGRAMS * MAX_CANDIDATES_PER_TRIGRAM names, however many forms the index holds.
+    """
+    if not _trigrams_built:
+        _build_trigrams()
+
+    query_trigrams = get_trigrams(query)
+    candidates = _candidates(normalize_name(query), query_trigrams)
+    scored = ((_dice(query_trigrams, _name_trigrams[name]), name) for name in candidates)
+    best = heapq.nlargest(k, scored)
+    return [name for score, name in best if score >= min_similarity]
+
+def did_you_mean(query: str) -> str:
+    """Get a " Did you mean ...?" hint for a name that couldn't be found, or an empty string."""
+    suggestions = suggest(str(query))
+    if not suggestions:
+        return ""
+    return " Did you mean " + ", ".join(f"**{display_name(name)}**" for name in suggestions) + "?"
+
+def display_name(name: str) -> str:
+    """Get a readable version of a canonical Pokémon name, e.g. "charizard-mega-x" -> "Charizard Mega X"."""
+    return name.replace('-', ' ').title()
+
+async def pokemon_name_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """Autocomplete function for Pokémon names, answered from memory."""
+    if current.strip().lstrip('#').isdigit():
+        name = _names_by_id.get(int(current.strip().lstrip('#')))
+        names = [name] if name else []
+    else:
+        names = search_prefix(current)
+
+    return [
+        app_commands.Choice(name=f"{display_name(name)} (#{_ids[name]})", value=name)
+        for name in names
+    ][:25]  # Discord limits to 25 choices
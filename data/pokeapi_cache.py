@@ -0,0 +1,181 @@
+import sqlite3
+import os
+import time
+import json
+import zlib
+import asyncio
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Cache file path
+CACHE_FILE = os.path.join(os.path.dirname(__file__), 'pokeapi_cache.db')
+
+# PokeAPI data practically never changes, so entries are kept for a long time
+CACHE_TTL_SECONDS = int(os.getenv("POKEAPI_CACHE_TTL", str(30 * 24 * 60 * 60)))  # 30 days
+CACHE_MAX_BYTES = int(os.getenv("POKEAPI_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# Only refresh the access time of an entry once in a while, so reads don't turn into writes
+ACCESS_UPDATE_INTERVAL = 60 * 60
+
+class PokeAPICache:
+    """
+    Persistent cache for PokeAPI responses.
+
+    Responses are stored as compressed JSON in a SQLite file, keyed by the SHA-256 of their URL.
+    Entries older than the TTL are refetched, but kept around so they can still be served
+    when PokeAPI is down or rate limiting us. When the cache grows over its size limit,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, ttl: int = CACHE_TTL_SECONDS, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.conn = None
+        self.total_bytes = 0
+
+    def get_connection(self):
+        """Get a connection to the cache database, opening it and creating the table on first use"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path)
+            # The cache can always be rebuilt, so trade durability for speed
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.setup_cache()
+        return self.conn
+
+    def close(self):
+        """Close the cache connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def setup_cache(self):
+        """Create the cache table if it doesn't exist"""
+        conn = self.conn
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            body BLOB,
+            size INTEGER,
+            fetched_at REAL,
+            last_access REAL
+        )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        conn.commit()
+
+        row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self.total_bytes = row[0]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[Tuple[Any, int]]:
+        """
+        Get a cached response for a URL, and the length of its JSON in bytes.
+
+        Returns None if the URL is not cached, or if the entry is expired and allow_stale is False.
+        """
+        try:
+            conn = self.get_connection()
+            key = self._key(url)
+            row = conn.execute(
+                "SELECT body, fetched_at, last_access FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            body, fetched_at, last_access = row
+            now = time.time()
+            if not allow_stale and now - fetched_at > self.ttl:
+                return None
+
+            if now - last_access > ACCESS_UPDATE_INTERVAL:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+
+            raw = zlib.decompress(body)
+            return json.loads(raw), len(raw)
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Error reading PokeAPI cache for {url}: {e}")
+            return None
+
+    def set(self, url: str, data: Any):
+        """Store a response for a URL, evicting old entries if the cache is full."""
+        try:
+            conn = self.get_connection()
+            key = self._key(url)
+            body = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+            now = time.time()
+
+            old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, body, len(body), now, now)
+            )
+            conn.commit()
+
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+        except sqlite3.Error as e:
+            print(f"Error writing PokeAPI cache for {url}: {e}")
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache is below 90% of its size limit."""
+        conn = self.get_connection()
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+
+        evicted = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((key,))
+            self.total_bytes -= size
+
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        conn.commit()
+
+class AsyncPokeAPICache:
+    """
+    Async access to the PokeAPI cache, for use from the event loop.
+
+    Every lookup, decompression and write runs on a dedicated cache thread that owns the connection,
+    so a slow disk or a large eviction only delays the fetch waiting for it instead of the whole bot.
+    The connection is opened on the first lookup, not at import.
+    """
+
+    def __init__(self, cache: Optional[PokeAPICache] = None):
+        self.cache = cache or PokeAPICache()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pokeapi-cache")
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a function on the cache thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def get(self, url: str, allow_stale: bool = False) -> Optional[Tuple[Any, int]]:
+        """Get a cached response for a URL and the length of its JSON, see PokeAPICache.get"""
+        return await self.run(self.cache.get, url, allow_stale)
+
+    async def set(self, url: str, data: Any):
+        """Store a response for a URL, see PokeAPICache.set"""
+        await self.run(self.cache.set, url, data)
+
+    async def close(self):
+        """Close the connection and stop the cache thread. Called on shutdown by bot.py."""
+        await self.run(self.cache.close)
+        self._executor.shutdown(wait=True)
+
+# Initialize the cache
+pokeapi_cache = AsyncPokeAPICache()
@@ -0,0 +1,325 @@
+import os
+import gzip
+import json
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+from data.help_functions import fetch_data, gather_limited, POKEAPI_BASE_URL
+from data.http_client import get_session
+from data.evolutions import EvolutionChain, index_chain, get_indexed_chain, get_species_chain
+from data import name_index
+
+# Path for the bundled Pokédex dataset, built by scripts/build_pokedex.py
+POKEDEX_FILE = os.path.join(os.path.dirname(__file__), 'pokedex.json.gz')
+
+# Maximum number of parallel PokeAPI requests for a single lookup
+FETCH_CONCURRENCY = 2
+
+# Maximum number of parallel PokeAPI requests while building the dataset on startup
+BUILD_CONCURRENCY = 10
+
+# The running background build of the dataset, see start_pokedex_build
+_build_task: Optional[asyncio.Task] = None
+
+# Pokémon entries by National Pokédex ID
+# Structure: {pokemon_id: {"id", "name", "species", "types", "abilities", "stats", "sprite", "artwork",
+#                          "height", "weight", "description", "evolution_chain"}}
+pokemon_entries: Dict[int, Dict[str, Any]] = {}
+
+# Lookup from Pokémon name to ID
+pokemon_names: Dict[str, int] = {}
+
+# Every Pokémon and form on PokeAPI, including the ones without an entry
+# Structure: {pokemon_name: pokemon_id}
+all_pokemon_names: Dict[str, int] = {}
+
+# Evolution chains by chain ID
+# Structure: {chain_id: [[species_name, evolves_from_species_name, evolution_details], ...]}
+evolution_chains: Dict[int, List[List[Optional[str]]]] = {}
+
+def build_entry(pokemon_data: Dict[str, Any], species_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a compact Pokédex entry from the PokeAPI pokemon and pokemon-species responses."""
+    # Get English description
+    description = None
+    for entry in species_data['flavor_text_entries']:
+        if entry['language']['name'] == 'en':
+            description = entry['flavor_text'].replace('\n', ' ').replace('\f', ' ')
+            break
+
+    evolution_chain = None
+    if species_data.get('evolution_chain'):
+        evolution_chain = url_to_id(species_data['evolution_chain']['url'])
+
+    return {
+        "id": pokemon_data['id'],
+        "name": pokemon_data['name'],
+        "species": species_data['name'],
+        "types": [t['type']['name'] for t in pokemon_data['types']],
+        "abilities": [a['ability']['name'] for a in pokemon_data['abilities']],
+        "stats": {s['stat']['name']: s['base_stat'] for s in pokemon_data['stats']},
+        "sprite": pokemon_data['sprites']['front_default'],
+        "artwork": pokemon_data['sprites']['other']['official-artwork']['front_default'],
+        "height": pokemon_data['height'],
+        "weight": pokemon_data['weight'],
+        "description": description,
+        "evolution_chain": evolution_chain
+    }
+
+def build_evolution_chain(evo_data: Dict[str, Any]) -> List[List[Optional[str]]]:
+    """Flatten a PokeAPI evolution-chain response into a list of [species, evolves_from, details] stages."""
+    stages = []
+
+    def parse_evolution(chain_link, evolves_from=None, evo_details=""):
+        species_name = chain_link['species']['name']
+        stages.append([species_name, evolves_from, evo_details])
+
+        for evolution in chain_link.get('evolves_to', []):
+            evo_details = ""
+            if evolution.get('evolution_details'):
+                detail = evolution['evolution_details'][0]
+                if 'min_level' in detail and detail['min_level']:
+                    evo_details = f" (Level {detail['min_level']})"
+                elif 'item' in detail and detail['item']:
+                    evo_details = f" ({detail['item']['name'].replace('-', ' ').capitalize()})"
+                elif 'trigger' in detail and detail['trigger']['name'] == 'trade':
+                    evo_details = " (Trade)"
+            parse_evolution(evolution, species_name, evo_details)
+
+    parse_evolution(evo_data['chain'])
+    return stages
+
+def url_to_id(url: str) -> int:
+    """Get the ID from a PokeAPI resource URL, e.g. .../evolution-chain/2/ -> 2."""
+    return int(url.rstrip('/').split('/')[-1])
+
+def normalize_query(query: Union[str, int]) -> Union[str, int]:
+    """Normalize a user supplied Pokémon name or ID."""
+    query = str(query).strip().lower().replace(' ', '-')
+    if query.isdigit():
+        return int(query)
+    return query
+
+def add_entry(entry: Dict[str, Any]):
+    """Add an entry to the in-memory Pokédex."""
+    pokemon_entries[entry['id']] = entry
+    pokemon_names[entry['name']] = entry['id']
+    name_index.add_name(entry['name'], entry['id'], entry['species'])
+
+def get_cached_pokemon(query: Union[str, int]) -> Optional[Dict[str, Any]]:
+    """Get a Pokémon entry from memory only. Returns None if it isn't known locally."""
+    query = normalize_query(query)
+    if isinstance(query, str):
+        query = pokemon_names.get(query)
+        if query is None:
+            return None
+    return pokemon_entries.get(query)
+
+async def get_pokemon(query: Union[str, int]) -> Union[Dict[str, Any], str, None]:
+    """
+    Get a Pokémon entry by name or National Pokédex ID.
+
+    Reads from the bundled dataset and only falls back to PokeAPI for unknown entries.
+    Returns None if the Pokémon doesn't exist and "error" if it couldn't be fetched.
+    """
+    # Resolve aliases and misspelled punctuation locally, and reject unknown names without a request
+    query = name_index.resolve(query)
+    if query is None:
+        return None
+
+    entry = get_cached_pokemon(query)
+    if entry is not None:
+        return entry
+
+    session = get_session()
+
+    # Round 1: when the name index knows the query is the default form of a species, the species shares
+    # its ID and is fetched together with the pokemon. Otherwise it is fetched by URL afterwards.
+    pokemon_url = f"{POKEAPI_BASE_URL}pokemon/{query}"
+    species_id = name_index.get_species_id(query)
+    if species_id is not None:
+        pokemon_data, species_data = await gather_limited(
+            FETCH_CONCURRENCY,
+            fetch_data(session, pokemon_url),
+            fetch_data(session, f"{POKEAPI_BASE_URL}pokemon-species/{species_id}")
+        )
+    else:
+        pokemon_data, species_data = await fetch_data(session, pokemon_url), None
+    if pokemon_data is None or pokemon_data == "error":
+        return pokemon_data
+
+    if not isinstance(species_data, dict) or species_data['name'] != pokemon_data['species']['name']:
+        species_data = await fetch_data(session, pokemon_data['species']['url'])
+        if species_data is None or species_data == "error":
+            return "error"
+
+    entry = build_entry(pokemon_data, species_data)
+    add_entry(entry)
+    return entry
+
+async def get_evolution_chain(chain_id: Optional[int]) -> Optional[EvolutionChain]:
+    """
+    Get the indexed evolution chain by ID, fetching it from PokeAPI if it isn't in the bundled dataset.
+    Each chain is only parsed once and shared by all species in it.
+    """
+    if chain_id is None:
+        return None
+
+    chain = get_indexed_chain(chain_id)
+    if chain is not None:
+        return chain
+
+    if chain_id not in evolution_chains:
+        evo_data = await fetch_data(get_session(), f"{POKEAPI_BASE_URL}evolution-chain/{chain_id}")
+        if evo_data is None or evo_data == "error":
+            return None
+        evolution_chains[chain_id] = build_evolution_chain(evo_data)
+
+    return index_chain(chain_id, evolution_chains[chain_id])
+
+async def get_pokemon_with_evolutions(query: Union[str, int]) -> Tuple[Union[Dict[str, Any], str, None], Optional[EvolutionChain]]:
+    """
+    Get a Pokémon entry together with its evolution chain.
+
+    For Pokémon that are not in the bundled dataset this takes two rounds of requests when the name
+    index knows the species (the pokemon and species in parallel, then the evolution chain), and three
+    for alternate forms and unknown names, whose species is only known from the pokemon.
+    """
+    entry = await get_pokemon(query)
+    if entry is None or entry == "error":
+        return entry, None
+
+    # Every species of a chain shares it, so a chain indexed for one member is found for all of them
+    chain = get_species_chain(entry['species'])
+    if chain is not None:
+        return entry, chain
+
+    # Round 2: the evolution chain depends on the species
+    return entry, await get_evolution_chain(entry['evolution_chain'])
+
+def load_pokedex():
+    """Load the bundled Pokédex dataset, if it has been built."""
+    if not os.path.exists(POKEDEX_FILE):
+        # Built on startup by start_pokedex_build, Pokémon are fetched from PokeAPI until then
+        return
+
+    try:
+        with gzip.open(POKEDEX_FILE, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+
+        for entry in data['pokemon'].values():
+            pokemon_entries[entry['id']] = entry
+            pokemon_names[entry['name']] = entry['id']
+
+        for chain_id_str, stages in data['chains'].items():
+            evolution_chains[int(chain_id_str)] = stages
+
+        all_pokemon_names.update(data.get('names', {}))
+
+        # Build the name index for lookups and autocomplete
+        names = dict(all_pokemon_names)
+        names.update(pokemon_names)
+        name_index.build_index(
+            names,
+            {entry['name']: entry['species'] for entry in pokemon_entries.values()},
+            complete=bool(all_pokemon_names)
+        )
+    except Exception as e:
+        print(f"Error loading Pokédex dataset: {e}")
+
+async def _build_pokemon(pokemon_id: int, semaphore: asyncio.Semaphore):
+    """Fetch and add a single Pokémon to the Pokédex."""
+    async with semaphore:
+        session = get_session()
+        pokemon_data = await fetch_data(session, f"{POKEAPI_BASE_URL}pokemon/{pokemon_id}", cache_in_memory=False)
+        if not pokemon_data or pokemon_data == "error":
+            print(f"Skipping Pokémon #{pokemon_id}: could not fetch Pokémon data")
+            return
+
+        species_data = await fetch_data(session, pokemon_data['species']['url'], cache_in_memory=False)
+        if not species_data or species_data == "error":
+            print(f"Skipping Pokémon #{pokemon_id}: could not fetch species data")
+            return
+
+        add_entry(build_entry(pokemon_data, species_data))
+
+async def _build_chain(chain_id: int, semaphore: asyncio.Semaphore):
+    """Fetch and add a single evolution chain to the Pokédex."""
+    async with semaphore:
+        evo_data = await fetch_data(get_session(), f"{POKEAPI_BASE_URL}evolution-chain/{chain_id}",
+                                    cache_in_memory=False)
+        if not evo_data or evo_data == "error":
+            print(f"Skipping evolution chain #{chain_id}: could not fetch chain data")
+            return
+
+        evolution_chains[chain_id] = build_evolution_chain(evo_data)
+
+async def build_pokedex(limit: int = 0, concurrency: int = BUILD_CONCURRENCY) -> bool:
+    """
+    Fetch every Pokémon species, their evolution chains and the names of all forms from PokeAPI
+    into the in-memory Pokédex. Returns False if PokeAPI couldn't be reached.
+
+    Responses only go through the PokeAPI disk cache, not the memory cache, as nothing reads them again.
+
+    Args:
+        limit: Number of Pokémon to include, 0 for all species
+        concurrency: Number of parallel requests to PokeAPI
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    if not limit:
+        species_list = await fetch_data(get_session(), f"{POKEAPI_BASE_URL}pokemon-species?limit=1",
+                                        cache_in_memory=False)
+        if not species_list or species_list == "error":
+            print("Could not fetch the number of Pokémon species from PokeAPI.")
+            return False
+        limit = species_list['count']
+
+    # Names of every Pokémon and form, for the name index and autocomplete
+    pokemon_list = await fetch_data(get_session(), f"{POKEAPI_BASE_URL}pokemon?limit=100000", cache_in_memory=False)
+    if pokemon_list and pokemon_list != "error":
+        for result in pokemon_list['results']:
+            all_pokemon_names[result['name']] = url_to_id(result['url'])
+    else:
+        print("Could not fetch the list of all Pokémon, the name index will only contain the dataset entries.")
+
+    print(f"Fetching {limit} Pokémon...")
+    await asyncio.gather(*(_build_pokemon(pokemon_id, semaphore) for pokemon_id in range(1, limit + 1)))
+
+    chain_ids = {entry['evolution_chain'] for entry in pokemon_entries.values() if entry['evolution_chain']}
+    print(f"Fetching {len(chain_ids)} evolution chains...")
+    await asyncio.gather(*(_build_chain(chain_id, semaphore) for chain_id in sorted(chain_ids)))
+    return True
+
+async def _build_missing_pokedex():
+    try:
+        if await build_pokedex():
+            save_pokedex()
+            load_pokedex()
+            print(f"Built the Pokédex dataset with {len(pokemon_entries)} Pokémon")
+    except Exception as e:
+        print(f"Error building Pokédex dataset: {e}")
+
+def start_pokedex_build():
+    """
+    Build the Pokédex dataset in the background if it doesn't exist yet. Called on startup by bot.py.
+
+    Until it is done, Pokémon are fetched from PokeAPI on demand as before. Every response is
+    stored in the PokeAPI cache, so an interrupted build continues where it stopped on the next start.
+    """
+    global _build_task
+    if os.path.exists(POKEDEX_FILE) or _build_task is not None:
+        return
+    print("No Pokédex dataset found, building it from PokeAPI in the background.")
+    _build_task = asyncio.create_task(_build_missing_pokedex())
+
+def save_pokedex(path: str = POKEDEX_FILE):
+    """Save the in-memory Pokédex to a compact gzipped JSON file."""
+    data = {
+        'pokemon': {str(pokemon_id): entry for pokemon_id, entry in sorted(pokemon_entries.items())},
+        'chains': {str(chain_id): stages for chain_id, stages in sorted(evolution_chains.items())},
+        'names': dict(sorted(all_pokemon_names.items(), key=lambda item: item[1]))
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+# Load the Pokédex when module is imported
+load_pokedex()
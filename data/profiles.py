@@ -1,23 +1,89 @@
+import os
 import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 from data.database import db
+from data.memory_cache import LRUCache
 
-def get_user_profile(user_id: int) -> Dict[str, Any]:
+# Maximum number of user IDs per query, older SQLite versions allow at most 999 parameters
+QUERY_CHUNK_SIZE = 500
+
+# Profiles shown by /profile, by user ID. Entries are removed when the user gets a badge.
+# Structure: {user_id: {"id": ..., "first_seen": ..., "badges": [badge, ...]}}
+profile_cache = LRUCache(int(os.getenv("PROFILE_CACHE_SIZE", "1024")))
+
+# Increased on every invalidation, so a profile read before a change is never cached after it
+_profile_generation = 0
+
+def invalidate_profiles(user_ids: Optional[Iterable[int]] = None):
+    """Remove profiles from the cache after their badges changed, or all profiles if no users are given."""
+    global _profile_generation
+    _profile_generation += 1
+    if user_ids is None:
+        profile_cache.clear()
+        return
+    for user_id in user_ids:
+        profile_cache.pop(user_id)
+
+async def _load_profile_view(user_id: int) -> Dict[str, Any]:
+    # The user, their badges and the badge emojis in one query, which also works for users that
+    # aren't stored yet. Both joins are index lookups.
+    rows = await db.fetch_all(
+        """SELECT u.first_seen, ub.badge_name, ub.acquired_from, ub.date, b.name AS badge_exists, b.emoji_id
+           FROM (SELECT ? AS id) q
+           LEFT JOIN users u ON u.id = q.id
+           LEFT JOIN user_badges ub ON ub.user_id = q.id
+           LEFT JOIN badges b ON b.name = ub.badge_name
+           ORDER BY ub.id""",
+        (user_id,)
+    )
+    
+    return {
+        "id": user_id,
+        "first_seen": rows[0]["first_seen"],
+        "badges": [
+            {
+                "name": row["badge_name"],
+                "acquired_from": row["acquired_from"],
+                "date": row["date"],
+                "emoji_id": row["emoji_id"]
+            }
+            for row in rows if row["badge_exists"] is not None
+        ]
+    }
+
+async def get_profile_view(user_id: int) -> Dict[str, Any]:
+    """
+    Get everything /profile shows about a user: their first seen date and their badges with emoji IDs.
+    
+    Read with a single query, or from the cache. Unlike get_user_profile, this never creates the user.
+    """
+    profile = profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+    
+    generation = _profile_generation
+    profile = await profile_cache.coalesce(user_id, lambda: _load_profile_view(user_id))
+    if generation == _profile_generation:
+        profile_cache.set(user_id, profile)
+    return profile
+
+async def get_user_profile(user_id: int) -> Dict[str, Any]:
     """Get a user's profile, creating it if it doesn't exist."""
     # Check if user exists
-    user = db.fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+    user = await db.fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
     
     if not user:
         # Create new user
         now = datetime.datetime.now().isoformat()
-        db.execute(
+        await db.execute(
             "INSERT INTO users (id, first_seen, created_at, updated_at) VALUES (?, ?, ?, ?)",
             (user_id, now, now, now)
         )
+        invalidate_profiles([user_id])
         return {"id": user_id, "first_seen": now, "badges": []}
     
     # Get user badges
-    badges = get_user_badges(user_id)
+    badges = await get_user_badges(user_id)
     
     return {
         "id": user_id,
@@ -25,9 +91,9 @@ def get_user_profile(user_id: int) -> Dict[str, Any]:
         "badges": badges
     }
 
-def get_user_badges(user_id: int) -> List[Dict[str, Any]]:
+async def get_user_badges(user_id: int) -> List[Dict[str, Any]]:
     """Get a list of badge objects that the user has earned."""
-    rows = db.fetch_all(
+    rows = await db.fetch_all(
         """SELECT ub.badge_name, ub.acquired_from, ub.date, b.emoji_id 
            FROM user_badges ub
            JOIN badges b ON ub.badge_name = b.name
@@ -45,74 +111,89 @@ def get_user_badges(user_id: int) -> List[Dict[str, Any]]:
         for row in rows
     ]
 
-def get_user_badge_names(user_id: int) -> List[str]:
+async def get_user_badge_names(user_id: int) -> List[str]:
     """Get a list of badge names that the user has earned."""
-    rows = db.fetch_all(
+    rows = await db.fetch_all(
         "SELECT badge_name FROM user_badges WHERE user_id = ?",
         (user_id,)
     )
     
     return [row["badge_name"] for row in rows]
 
-def has_badge(user_id: int, badge_name: str) -> bool:
+async def has_badge(user_id: int, badge_name: str) -> bool:
     """Check if a user has a specific badge."""
-    row = db.fetch_one(
+    row = await db.fetch_one(
         "SELECT 1 FROM user_badges WHERE user_id = ? AND badge_name = ?",
         (user_id, badge_name)
     )
     
     return row is not None
 
-def award_badge(user_id: int, badge_name: str, acquired_from: str = "Unknown") -> bool:
+async def award_badge(user_id: int, badge_name: str, acquired_from: str = "Unknown") -> bool:
     """Award a badge to a user. Returns True if the badge was newly awarded."""
-    # Check if badge exists
-    badge = db.fetch_one("SELECT name FROM badges WHERE name = ?", (badge_name,))
-    if not badge:
-        print(f"Warning: Attempted to award non-existent badge '{badge_name}'")
-        return False
-    
-    # Check if user already has this badge
-    if has_badge(user_id, badge_name):
-        return False
+    results = await award_badges_to_users([user_id], badge_name, acquired_from)
+    return results[user_id]
+
+async def award_badges_to_users(user_ids: List[int], badge_name: str, acquired_from: str = "Unknown") -> Dict[int, bool]:
+    """Award a badge to multiple users at once.
+    Returns a dictionary of user_id -> success pairs.
     
-    # Make sure user exists
-    get_user_profile(user_id)
+    All awards are written in one transaction, so ending an event with hundreds of winners is a single commit."""
+    user_ids = list(dict.fromkeys(user_ids))
     
-    # Award badge
-    now = datetime.datetime.now().isoformat()
-    db.execute(
-        "INSERT INTO user_badges (user_id, badge_name, acquired_from, date) VALUES (?, ?, ?, ?)",
-        (user_id, badge_name, acquired_from, now)
-    )
+    # Check and award in one transaction, so the results match what was inserted.
+    # The unique index on (user_id, badge_name) makes sure a badge is never stored twice.
+    async with db.transaction():
+        # Check if badge exists
+        badge = await db.fetch_one("SELECT name FROM badges WHERE name = ?", (badge_name,))
+        if not badge:
+            print(f"Warning: Attempted to award non-existent badge '{badge_name}'")
+            return {user_id: False for user_id in user_ids}
+        
+        # Find the users that already have this badge, in chunks to stay below SQLite's parameter limit
+        owners = set()
+        for i in range(0, len(user_ids), QUERY_CHUNK_SIZE):
+            chunk = user_ids[i:i + QUERY_CHUNK_SIZE]
+            rows = await db.fetch_all(
+                f"SELECT user_id FROM user_badges WHERE badge_name = ? AND user_id IN ({', '.join('?' * len(chunk))})",
+                (badge_name, *chunk)
+            )
+            owners.update(row["user_id"] for row in rows)
+        new_owners = [user_id for user_id in user_ids if user_id not in owners]
+        
+        # Make sure the users exist, then award the badge
+        now = datetime.datetime.now().isoformat()
+        await db.executemany(
+            "INSERT OR IGNORE INTO users (id, first_seen, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            [(user_id, now, now, now) for user_id in new_owners]
+        )
+        await db.executemany(
+            "INSERT OR IGNORE INTO user_badges (user_id, badge_name, acquired_from, date) VALUES (?, ?, ?, ?)",
+            [(user_id, badge_name, acquired_from, now) for user_id in new_owners]
+        )
+        invalidate_profiles(new_owners)
     
-    return True
+    return {user_id: user_id not in owners for user_id in user_ids}
 
-def award_badges_to_users(user_ids: List[int], badge_name: str, acquired_from: str = "Unknown") -> Dict[int, bool]:
-    """Award a badge to multiple users at once.
-    Returns a dictionary of user_id -> success pairs."""
-    results = {}
-    for user_id in user_ids:
-        results[user_id] = award_badge(user_id, badge_name, acquired_from)
-    return results
-
-def check_special_badges(user_id: int):
+async def check_special_badges(user_id: int):
     """Check and award special badges based on criteria."""
-    # Check for early adopter badge (first profile access before 2025-09-01)
-    if not has_badge(user_id, "snorlaxbadge"):
-        today = datetime.datetime.now()
-        cutoff_date = datetime.datetime(2025, 9, 1)
-        
-        if today < cutoff_date:
-            award_badge(user_id, "snorlaxbadge", "Early adopter")
+    # Check for early adopter badge (first profile access before 2025-09-01).
+    # The date is checked first, so after the cutoff this doesn't touch the database.
+    today = datetime.datetime.now()
+    cutoff_date = datetime.datetime(2025, 9, 1)
+    
+    if today < cutoff_date:
+        # award_badge skips users that already have the badge
+        await award_badge(user_id, "snorlaxbadge", "Early adopter")
 
-def get_all_badges() -> List[Dict[str, Any]]:
+async def get_all_badges() -> List[Dict[str, Any]]:
     """Get all available badges."""
-    rows = db.fetch_all("SELECT * FROM badges")
+    rows = await db.fetch_all("SELECT * FROM badges")
     
     return [dict(row) for row in rows]
 
-def get_badge_details(badge_name: str) -> Optional[Dict[str, Any]]:
+async def get_badge_details(badge_name: str) -> Optional[Dict[str, Any]]:
     """Get details for a specific badge."""
-    row = db.fetch_one("SELECT * FROM badges WHERE name = ?", (badge_name,))
+    row = await db.fetch_one("SELECT * FROM badges WHERE name = ?", (badge_name,))
     
     return dict(row) if row else None
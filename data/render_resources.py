@@ -0,0 +1,95 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from PIL import Image, ImageFont
+from dotenv import load_dotenv
+from data.memory_cache import LRUCache
+
+load_dotenv()
+
+# Fonts placed here are used before any system font, stored as fonts/<family>.ttf (e.g. fonts/sans.ttf)
+FONT_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
+
+# Font file to use for the "sans" family instead of searching for one (optional)
+FONT_PATH = os.getenv("FONT_PATH")
+
+# Font files tried for every family, in order. Plain file names are looked up in the system font
+# directories by PIL, so the same list works on Windows, macOS and Linux.
+FONT_CANDIDATES = {
+    "sans": [
+        "arial.ttf",
+        "Arial.ttf",
+        "DejaVuSans.ttf",
+        "LiberationSans-Regular.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/System/Library/Fonts/Supplemental/Arial.ttf",
+    ],
+    "sans-bold": [
+        "arialbd.ttf",
+        "Arial Bold.ttf",
+        "DejaVuSans-Bold.ttf",
+        "LiberationSans-Bold.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+        "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    ],
+}
+
+# Blank canvases by (mode, size, color), copied for every render instead of being allocated and filled
+canvas_cache = LRUCache(
+    max_entries=64,
+    max_bytes=int(os.getenv("CANVAS_CACHE_MB", "32")) * 1024 * 1024,
+    sizeof=lambda image: image.width * image.height * len(image.getbands())
+)
+
+# Renders run in the render pool, so the canvas cache is shared between threads
+_cache_lock = threading.Lock()
+
+# Loaded fonts are kept per thread, as PIL fonts aren't safe to draw with from several threads at once
+_thread_fonts = threading.local()
+
+@lru_cache(maxsize=None)
+def resolve_font_path(family: str = "sans") -> Optional[str]:
+    """Find the font file of a family, or None if no candidate is installed. Resolved once per family."""
+    candidates = [os.path.join(FONT_DIR, f"{family}.ttf")]
+    if family == "sans" and FONT_PATH:
+        candidates.insert(0, FONT_PATH)
+    candidates += FONT_CANDIDATES.get(family, [])
+
+    for candidate in candidates:
+        try:
+            # Loading the font also resolves plain file names in the system font directories
+            return ImageFont.truetype(candidate, 10).path
+        except OSError:
+            continue
+    print(f"No font found for {family}, using the default font")
+    return None
+
+def get_font(size: int, family: str = "sans") -> ImageFont.ImageFont:
+    """
+    Get a font of a family at a size, loaded only once per render thread.
+
+    Falls back to PIL's built-in font when no font file of the family is installed.
+    """
+    fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = getattr(_thread_fonts, 'fonts', None)
+    if fonts is None:
+        fonts = _thread_fonts.fonts = {}
+
+    font = fonts.get((family, size))
+    if font is None:
+        path = resolve_font_path(family)
+        font = ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+        fonts[(family, size)] = font
+    return font
+
+def get_canvas(mode: str, size: Tuple[int, int], color) -> Image.Image:
+    """Get a new image filled with a color. The returned image is the caller's to draw on."""
+    key = (mode, size, color)
+    with _cache_lock:
+        canvas = canvas_cache.get(key)
+        if canvas is None:
+            canvas = Image.new(mode, size, color)
+            canvas_cache.set(key, canvas)
+    return canvas.copy()
@@ -0,0 +1,56 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Render pool settings (can be tuned from the .env file)
+RENDER_MODE = os.getenv("RENDER_MODE", "thread")  # "thread", or "process" to render on other CPU cores
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))  # Renders running at the same time
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", str(RENDER_WORKERS * 4)))  # Renders running or waiting for a worker
+
+# The shared pool, created on first use
+_executor: Optional[Executor] = None
+
+# Limits the renders waiting for the pool, further callers wait until there is room
+_queue_slots: Optional[asyncio.Semaphore] = None
+
+def _create_executor() -> Executor:
+    if RENDER_MODE == "process":
+        return ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+    return ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+
+def get_executor() -> Executor:
+    """Get the shared render pool, creating it if needed."""
+    global _executor
+    if _executor is None:
+        _executor = _create_executor()
+    return _executor
+
+async def render(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking image function in the render pool and wait for its result.
+
+    All PIL work should go through here, so large renders never block the event loop (and with it
+    the gateway heartbeat and every other command). At most RENDER_QUEUE_SIZE renders are queued
+    or running, callers beyond that wait for a free slot instead of piling up work.
+
+    In process mode, func must be a module level function and all arguments must be picklable.
+    """
+    global _queue_slots
+    if _queue_slots is None:
+        _queue_slots = asyncio.Semaphore(RENDER_QUEUE_SIZE)
+
+    async with _queue_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+def shutdown_renderer():
+    """Stop the render pool. Called on shutdown by bot.py."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
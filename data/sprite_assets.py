@@ -0,0 +1,87 @@
+import os
+import asyncio
+from typing import Any, Callable, Dict, Optional
+from data import sprite_effects
+from data.memory_cache import LRUCache
+from data.renderer import render
+from data.sprites import SPRITE_DIR, get_sprite_entry, read_file, write_file
+
+# Version of the transforms, bump it when their output changes so old renders aren't served anymore
+TRANSFORM_VERSION = 2
+
+# Directory for rendered sprites, stored as sprites/derived/v<version>/<transform>/<sprite hash>[-<params>].png
+DERIVED_DIR = os.path.join(SPRITE_DIR, 'derived', f"v{TRANSFORM_VERSION}")
+
+def render_silhouette(image_data: bytes) -> bytes:
+    """Render a black silhouette of a sprite."""
+    return sprite_effects.encode(sprite_effects.silhouette(sprite_effects.decode(image_data)))
+
+def render_pixelate(image_data: bytes, size: int = 6) -> bytes:
+    """Render a very pixelated version of a sprite, `size` by `size` blocks."""
+    return sprite_effects.encode(sprite_effects.pixelate(sprite_effects.decode(image_data), size))
+
+def render_outline(image_data: bytes, thickness: int = 1) -> bytes:
+    """Render only the outline of a sprite."""
+    return sprite_effects.encode(sprite_effects.outline(sprite_effects.decode(image_data), thickness=thickness))
+
+def render_blur(image_data: bytes, radius: int = 2) -> bytes:
+    """Render a blurred version of a sprite."""
+    return sprite_effects.encode(sprite_effects.blur(sprite_effects.decode(image_data), radius))
+
+def render_reveal(image_data: bytes, percent: int = 50) -> bytes:
+    """Render a sprite with the top `percent` in color and the rest as a silhouette."""
+    return sprite_effects.encode(sprite_effects.partial_reveal(sprite_effects.decode(image_data), percent / 100))
+
+# Available transforms: name -> function(sprite PNG bytes, **params) -> PNG bytes
+TRANSFORMS: Dict[str, Callable[..., bytes]] = {
+    "silhouette": render_silhouette,
+    "pixelate": render_pixelate,
+    "outline": render_outline,
+    "blur": render_blur,
+    "reveal": render_reveal,
+}
+
+# Hot rendered sprites are kept in memory, bounded by their total size
+derived_memory_cache = LRUCache(
+    max_entries=100_000,
+    max_bytes=int(os.getenv("DERIVED_SPRITE_CACHE_MB", "16")) * 1024 * 1024
+)
+
+def derived_path(digest: str, transform: str, params: Dict[str, Any]) -> str:
+    """Get the path a rendered sprite is stored at on disk."""
+    suffix = "".join(f"-{name}{value}" for name, value in sorted(params.items()))
+    return os.path.join(DERIVED_DIR, transform, f"{digest}{suffix}.png")
+
+async def _load_derived(image_data: bytes, digest: str, transform: str, params: Dict[str, Any]) -> bytes:
+    """Load a rendered sprite from disk, rendering and storing it if it isn't there yet."""
+    path = derived_path(digest, transform, params)
+    data = await asyncio.to_thread(read_file, path)
+    if data is None:
+        data = await render(TRANSFORMS[transform], image_data, **params)
+        await asyncio.to_thread(write_file, path, data)
+    return data
+
+async def get_derived_sprite(pokemon_id: int, transform: str, variant: str = "default",
+                             url: Optional[str] = None, **params) -> Optional[bytes]:
+    """
+    Get the ready-to-send PNG bytes of a transformed sprite, e.g. a silhouette.
+
+    Rendered sprites are keyed by (sprite hash, transform, params), so they are only rendered once
+    per sprite and survive restarts. Any rendering happens in the render pool.
+    Returns None if the sprite isn't available.
+    """
+    if transform not in TRANSFORMS:
+        raise ValueError(f"Unknown sprite transform: {transform}")
+
+    sprite = await get_sprite_entry(pokemon_id, variant, url)
+    if sprite is None:
+        return None
+
+    key = (sprite.digest, transform, tuple(sorted(params.items())))
+    data = derived_memory_cache.get(key)
+    if data is not None:
+        return data
+
+    data = await derived_memory_cache.coalesce(key, lambda: _load_derived(sprite.data, sprite.digest, transform, params))
+    derived_memory_cache.set(key, data)
+    return data
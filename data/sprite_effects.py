@@ -0,0 +1,132 @@
+import io
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+from PIL import Image
+
+# Sprite effects, as NumPy operations on (height, width, 4) uint8 RGBA arrays.
+# Every effect returns a new array and leaves its input untouched.
+#
+# Per-channel operations on interleaved RGBA are slow in NumPy, so effects either work on whole
+# pixels (a uint32 view of the array) or on contiguous float planes, with sums over blocks and
+# windows done as small matrix products.
+
+# Pixels with a luminance at or below this count as background in sprites without transparency
+BACKGROUND_THRESHOLD = 3
+
+# Bit mask of the alpha byte of a pixel, in the byte order of this machine
+_ALPHA_BITS = np.array([0, 0, 0, 255], dtype=np.uint8).view(np.uint32)[0]
+
+def _pixel_bits(color: Tuple[int, int, int], alpha: int = 0) -> np.uint32:
+    """Get a color as a packed RGBA pixel."""
+    return np.array([*color, alpha], dtype=np.uint8).view(np.uint32)[0]
+
+def _pixels(rgba: np.ndarray) -> np.ndarray:
+    """View an RGBA array as one uint32 per pixel."""
+    return np.ascontiguousarray(rgba).view(np.uint32)[..., 0]
+
+def _from_pixels(pixels: np.ndarray) -> np.ndarray:
+    return pixels.view(np.uint8).reshape(*pixels.shape, 4)
+
+def decode(image_data: bytes) -> np.ndarray:
+    """Decode PNG bytes into an RGBA array."""
+    img = Image.open(io.BytesIO(image_data))
+    has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+    rgba = np.array(img.convert('RGBA'))
+    if not has_alpha:
+        # No transparency, treat (near) black pixels as the background
+        rgba[..., 3] = np.where(rgba[..., :3].max(axis=2) > BACKGROUND_THRESHOLD, 255, 0)
+    return rgba
+
+def encode(rgba: np.ndarray) -> bytes:
+    """Encode an RGBA array as PNG bytes."""
+    output = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(output, format='PNG')
+    return output.getvalue()
+
+def silhouette(rgba: np.ndarray, color: Tuple[int, int, int] = (0, 0, 0)) -> np.ndarray:
+    """Fill the whole sprite with a single color, keeping its shape."""
+    return _from_pixels((_pixels(rgba) & _ALPHA_BITS) | _pixel_bits(color))
+
+def _to_planes(rgba: np.ndarray) -> np.ndarray:
+    """Get an RGBA array as contiguous float planes (4, height, width), with the colors premultiplied by alpha."""
+    planes = np.ascontiguousarray(rgba.transpose(2, 0, 1)).astype(np.float32)
+    planes[:3] *= planes[3] / 255
+    return planes
+
+def _from_planes(planes: np.ndarray) -> np.ndarray:
+    """Turn premultiplied float planes back into an RGBA array."""
+    alpha = planes[3]
+    colors = planes * (255 / np.where(alpha > 0, alpha, 255))
+    colors[3] = alpha
+    np.clip(colors, 0, 255, out=colors)
+    return np.dstack(tuple(colors.astype(np.uint8)))
+
+@lru_cache(maxsize=64)
+def _block_matrix(length: int, blocks: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the (blocks, length) matrix that sums pixels into blocks, and the block of every pixel."""
+    block_of = (np.arange(length) * blocks) // length
+    return (block_of[None, :] == np.arange(blocks)[:, None]).astype(np.float32), block_of
+
+def pixelate(rgba: np.ndarray, size: int = 6) -> np.ndarray:
+    """
+    Pixelate a sprite into `size` by `size` blocks.
+
+    Every block gets the average color of its pixels, weighted by alpha so the transparent
+    background doesn't darken the edges of the sprite.
+    """
+    height, width = rgba.shape[:2]
+    rows, row_blocks = _block_matrix(height, min(size, height))
+    cols, col_blocks = _block_matrix(width, min(size, width))
+
+    planes = _to_planes(rgba)
+    block_sums = rows @ planes @ cols.T
+    blocks = _from_planes(block_sums / np.outer(rows.sum(axis=1), cols.sum(axis=1)))
+
+    # Scale the blocks back up to the original size
+    return blocks.take(row_blocks, axis=0).take(col_blocks, axis=1)
+
+def _dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    """Grow a boolean mask by `radius` pixels in every direction."""
+    grown = mask.copy()
+    for _ in range(radius):
+        step = grown.copy()
+        step[1:, :] |= grown[:-1, :]
+        step[:-1, :] |= grown[1:, :]
+        step[:, 1:] |= grown[:, :-1]
+        step[:, :-1] |= grown[:, 1:]
+        grown = step
+    return grown
+
+def outline(rgba: np.ndarray, color: Tuple[int, int, int] = (0, 0, 0), thickness: int = 1) -> np.ndarray:
+    """Draw only the outline around the sprite, everything else is transparent."""
+    mask = rgba[..., 3] > 0
+    border = _dilate(mask, thickness) & ~mask
+    return _from_pixels(np.where(border, _pixel_bits(color, 255), np.uint32(0)))
+
+@lru_cache(maxsize=64)
+def _box_matrix(length: int, radius: int) -> np.ndarray:
+    """Get the (length, length) matrix that averages every pixel with its `radius` neighbours, repeating the edges."""
+    matrix = np.zeros((length, length), dtype=np.float32)
+    offsets = np.arange(-radius, radius + 1)
+    for i in range(length):
+        np.add.at(matrix[i], np.clip(i + offsets, 0, length - 1), 1 / len(offsets))
+    return matrix
+
+def blur(rgba: np.ndarray, radius: int = 2) -> np.ndarray:
+    """Box blur a sprite, weighted by alpha so the transparent background doesn't bleed in."""
+    if radius <= 0:
+        return rgba.copy()
+    height, width = rgba.shape[:2]
+    planes = _box_matrix(height, radius) @ _to_planes(rgba) @ _box_matrix(width, radius).T
+    return _from_planes(planes)
+
+def partial_reveal(rgba: np.ndarray, fraction: float = 0.5, color: Tuple[int, int, int] = (0, 0, 0)) -> np.ndarray:
+    """Show the top `fraction` of the sprite in color and the rest as a silhouette."""
+    result = silhouette(rgba, color)
+    rows = np.flatnonzero(rgba[..., 3].any(axis=1))
+    if rows.size:
+        # Measure from the top of the sprite itself, not the empty space above it
+        cutoff = rows[0] + int(round((rows[-1] + 1 - rows[0]) * fraction))
+        result[:cutoff] = rgba[:cutoff]
+    return result
@@ -0,0 +1,104 @@
+import os
+import asyncio
+import hashlib
+import aiohttp
+from typing import NamedTuple, Optional
+from data.http_client import get_session
+from data.memory_cache import LRUCache
+
+# Directory for downloaded sprites, stored as sprites/<variant>/<pokemon_id>.png
+SPRITE_DIR = os.path.join(os.path.dirname(__file__), 'sprites')
+
+SPRITE_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/"
+
+# Download URL of every sprite variant
+SPRITE_URLS = {
+    "default": SPRITE_BASE_URL + "{pokemon_id}.png",
+    "shiny": SPRITE_BASE_URL + "shiny/{pokemon_id}.png",
+    "official-artwork": SPRITE_BASE_URL + "other/official-artwork/{pokemon_id}.png",
+}
+
+class Sprite(NamedTuple):
+    """PNG bytes of a sprite and their SHA-256 hash, which identifies the image content."""
+    data: bytes
+    digest: str
+
+# Hot sprites are kept in memory, bounded by their total size
+sprite_memory_cache = LRUCache(
+    max_entries=100_000,
+    max_bytes=int(os.getenv("SPRITE_MEMORY_CACHE_MB", "32")) * 1024 * 1024,
+    sizeof=lambda sprite: len(sprite.data)
+)
+
+def sprite_path(pokemon_id: int, variant: str = "default") -> str:
+    """Get the path a sprite is stored at on disk."""
+    return os.path.join(SPRITE_DIR, variant, f"{pokemon_id}.png")
+
+def read_file(path: str) -> Optional[bytes]:
+    """Read a stored image, or None if it doesn't exist."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def write_file(path: str, data: bytes):
+    """Store an image. It is written to a temporary file first, so a crash never leaves a half written file behind."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+async def _download(url: str) -> Optional[bytes]:
+    try:
+        async with get_session().get(url) as response:
+            if response.status == 200:
+                return await response.read()
+            if response.status != 404:
+                print(f"Error downloading sprite {url}: Status {response.status}")
+    except aiohttp.ClientError as e:
+        print(f"AIOHTTP client error downloading sprite {url}: {e}")
+    except asyncio.TimeoutError:
+        print(f"Timeout error downloading sprite {url}")
+    return None
+
+async def _load_sprite(pokemon_id: int, variant: str, url: Optional[str]) -> Optional[Sprite]:
+    """Load a sprite from disk, downloading and storing it if it isn't there yet."""
+    path = sprite_path(pokemon_id, variant)
+    data = await asyncio.to_thread(read_file, path)
+    if data is None:
+        data = await _download(url or SPRITE_URLS[variant].format(pokemon_id=pokemon_id))
+        if data is None:
+            return None
+        await asyncio.to_thread(write_file, path, data)
+    return Sprite(data, hashlib.sha256(data).hexdigest())
+
+async def get_sprite_entry(pokemon_id: int, variant: str = "default", url: Optional[str] = None) -> Optional[Sprite]:
+    """
+    Get a sprite with its content hash, from memory, disk or GitHub, in that order.
+
+    Args:
+        pokemon_id: National Pokédex ID (or PokeAPI form ID) of the Pokémon
+        variant: "default", "shiny" or "official-artwork"
+        url: Download URL to use instead of the standard one, e.g. the sprite URL of a Pokédex entry
+
+    Returns None if the Pokémon has no such sprite or it couldn't be downloaded.
+    """
+    if variant not in SPRITE_URLS:
+        raise ValueError(f"Unknown sprite variant: {variant}")
+
+    key = (pokemon_id, variant)
+    sprite = sprite_memory_cache.get(key)
+    if sprite is not None:
+        return sprite
+
+    sprite = await sprite_memory_cache.coalesce(key, lambda: _load_sprite(pokemon_id, variant, url))
+    if sprite is not None:
+        sprite_memory_cache.set(key, sprite)
+    return sprite
+
+async def get_sprite(pokemon_id: int, variant: str = "default", url: Optional[str] = None) -> Optional[bytes]:
+    """Get the PNG bytes of a sprite. See get_sprite_entry."""
+    sprite = await get_sprite_entry(pokemon_id, variant, url)
+    return sprite.data if sprite is not None else None
@@ -1,10 +1,14 @@
 import discord
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import random
 import math
 import io
-from PIL import Image, ImageDraw, ImageFont
-import aiohttp
+import threading
+from PIL import Image, ImageDraw
+from data.memory_cache import LRUCache
+from data.avatars import get_avatars
+from data.renderer import render
+from data.render_resources import get_font, get_canvas
 import os
 import json
 from discord import app_commands
@@ -12,6 +16,66 @@ from discord import app_commands
 # Path for tournament data file
 TOURNAMENT_DATA_FILE = os.path.join(os.path.dirname(__file__), 'tournament_data.json')
 
+# Constants for bracket image generation
+PADDING = 20
+MATCH_WIDTH = 180
+MATCH_HEIGHT = 80
+ROUND_SPACING = 200
+MATCH_SPACING = 100
+AVATAR_SIZE = 40
+CONNECTOR_WIDTH = 3
+
+# Largest supported tournament
+MAX_TOURNAMENT_SIZE = 1024
+
+# Brackets up to this many rounds (32 players) are drawn whole, larger ones are split in pages
+FULL_BRACKET_MAX_ROUNDS = 5
+
+# Rounds on a region page (16 players), which keeps every page below about 1600x1500 pixels
+REGION_ROUNDS = 4
+
+# Last rounds shown on the overview, drawn without avatars
+OVERVIEW_ROUNDS = 6
+
+class BracketStyle(NamedTuple):
+    """Sizes of the match boxes and the space around them."""
+    name: str
+    match_width: int
+    match_height: int
+    round_spacing: int
+    match_spacing: int
+    header_height: int
+    avatars: bool
+
+FULL_STYLE = BracketStyle("full", MATCH_WIDTH, MATCH_HEIGHT, ROUND_SPACING, MATCH_SPACING, 0, True)
+COMPACT_STYLE = BracketStyle("compact", 150, 34, 40, 10, 40, False)
+
+class BracketPage(NamedTuple):
+    """A part of a bracket: the root match and every match of its subtree from first_round on."""
+    key: tuple
+    title: str
+    root_match_id: int
+    first_round: int
+    style: BracketStyle
+
+# Drawn match boxes by match state, shared by all brackets and bounded by their sizes
+bracket_tile_cache = LRUCache(
+    max_entries=4096,
+    max_bytes=int(os.getenv("BRACKET_TILE_CACHE_MB", "16")) * 1024 * 1024,
+    sizeof=lambda tile: tile.width * tile.height * 3
+)
+
+# Last drawn image of every bracket page, with the state of the match boxes on it, bounded by the image sizes
+# Structure: {(guild_id, tournament_name, size, creator_id, view, ...): {'image': Image, 'tiles': {match_id: match state}}}
+bracket_composite_cache = LRUCache(
+    max_entries=64,
+    max_bytes=int(os.getenv("BRACKET_CACHE_MB", "64")) * 1024 * 1024,
+    sizeof=lambda cached: cached['image'].width * cached['image'].height * 3
+)
+
+# Renders run in the render pool, so the caches above are shared between threads
+_bracket_cache_lock = threading.Lock()
+
 # Dictionary to store active tournaments by guild ID
 # Structure: {guild_id: {tournament_name: Tournament}}
 active_tournaments = {}
@@ -193,6 +257,40 @@ class Match:
         self.next_match_id: Optional[int] = None
         self.completed = False
 
+class ParticipantSnapshot(NamedTuple):
+    """What a bracket shows of a participant."""
+    user_id: int
+    display_name: str
+    avatar_url: str
+
+class MatchSnapshot(NamedTuple):
+    """
+    A match as it was when a bracket render was requested.
+
+    Renders run in the render pool while commands keep changing the tournament on the event loop,
+    so they draw from snapshots instead of the live matches.
+    """
+    match_id: int
+    round_num: int
+    position: int
+    next_match_id: Optional[int]
+    completed: bool
+    winner_id: Optional[int]
+    participant1: Optional[ParticipantSnapshot]
+    participant2: Optional[ParticipantSnapshot]
+
+def _snapshot_participant(participant: Optional[Participant]) -> Optional[ParticipantSnapshot]:
+    if participant is None:
+        return None
+    return ParticipantSnapshot(participant.user_id, participant.display_name, participant.avatar_url)
+
+def _snapshot_match(match: Match) -> MatchSnapshot:
+    return MatchSnapshot(
+        match.match_id, match.round_num, match.position, match.next_match_id, match.completed,
+        match.winner.user_id if match.winner else None,
+        _snapshot_participant(match.participant1), _snapshot_participant(match.participant2)
+    )
+
 class Tournament:
     def __init__(self, name: str, size: int, creator_id: int):
         self.name = name
@@ -220,6 +318,9 @@ class Tournament:
         final_match = Match(match_id, num_rounds, 1)
         self.matches[match_id] = final_match
         
+        # Matches by round and position, to find the next match of every match
+        match_grid = {(num_rounds, 1): final_match}
+        
         # Create matches for earlier rounds
         for round_num in range(num_rounds - 1, 0, -1):
             matches_in_round = 2 ** (num_rounds - round_num)
@@ -230,11 +331,11 @@ class Tournament:
                 # Create match
                 match = Match(match_id, round_num, position)
                 self.matches[match_id] = match
+                match_grid[(round_num, position)] = match
                 
                 # Link to next match
                 parent_position = (position + 1) // 2
-                parent_match = next((m for m in self.matches.values() 
-                                     if m.round_num == round_num + 1 and m.position == parent_position), None)
+                parent_match = match_grid.get((round_num + 1, parent_position))
                 if parent_match:
                     match.next_match_id = parent_match.match_id
     
@@ -419,173 +520,311 @@ class Tournament:
                m.participant1 and m.participant2
         ]
 
-async def generate_bracket_image(tournament: Tournament) -> io.BytesIO:
-    """Generate an image visualization of the tournament bracket."""
-    # Constants for image generation
-    PADDING = 20
-    MATCH_WIDTH = 180
-    MATCH_HEIGHT = 80
-    ROUND_SPACING = 200
-    MATCH_SPACING = 100
-    AVATAR_SIZE = 40
-    CONNECTOR_WIDTH = 3
-    
-    # Calculate image dimensions
+def bracket_region_count(tournament: Tournament) -> int:
+    """Get the number of region pages of a tournament bracket."""
     num_rounds = max(m.round_num for m in tournament.matches.values())
-    max_matches_in_round = max(
-        sum(1 for m in tournament.matches.values() if m.round_num == r)
-        for r in range(1, num_rounds + 1)
-    )
+    count = 0
+    for last_round in range(REGION_ROUNDS, num_rounds + REGION_ROUNDS, REGION_ROUNDS):
+        count += 2 ** (num_rounds - min(last_round, num_rounds))
+    return count
+
+def get_match_region(tournament: Tournament, match_id: int) -> int:
+    """Get the region page a match is drawn on."""
+    num_rounds = max(m.round_num for m in tournament.matches.values())
+    match = tournament.matches[match_id]
     
-    image_width = (num_rounds * (MATCH_WIDTH + ROUND_SPACING)) + PADDING * 2
-    image_height = (max_matches_in_round * (MATCH_HEIGHT + MATCH_SPACING)) + PADDING * 2
+    # Regions of earlier rounds come first
+    region = 0
+    for last_round in range(REGION_ROUNDS, num_rounds + REGION_ROUNDS, REGION_ROUNDS):
+        last_round = min(last_round, num_rounds)
+        if match.round_num <= last_round:
+            return region + ((match.position - 1) >> (last_round - match.round_num)) + 1
+        region += 2 ** (num_rounds - last_round)
+
+def get_bracket_page(tournament: Tournament, guild_id: int, view: str = "auto", region: Optional[int] = None) -> BracketPage:
+    """
+    Get the part of a bracket to draw.
     
-    # Create base image
-    image = Image.new('RGBA', (image_width, image_height), (255, 255, 255, 255))
-    draw = ImageDraw.Draw(image)
+    Args:
+        tournament: The tournament
+        guild_id: The guild the tournament belongs to, tournament names are only unique within a guild
+        view: "overview" for the last rounds without avatars, "region" for a region page, or "auto" to draw
+              small brackets whole and show the overview of larger ones
+        region: Region to draw, from 1 to bracket_region_count(tournament). Implies the "region" view.
     
-    # Try to load fonts
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 24)
-        name_font = ImageFont.truetype("arial.ttf", 14)
-    except IOError:
-        # Fallback to default font
-        title_font = ImageFont.load_default()
-        name_font = ImageFont.load_default()
+    Regions split the bracket in stages of REGION_ROUNDS rounds, the first stage into regions of
+    2 ** REGION_ROUNDS players. Every region page draws REGION_ROUNDS rounds, so a shorter last stage
+    also shows the rounds before it. With 1024 players (10 rounds), regions 1 to 64 cover rounds 1-4,
+    regions 65 to 68 rounds 5-8 and region 69 rounds 7-10.
+    """
+    num_rounds = max(m.round_num for m in tournament.matches.values())
+    final = next(m for m in tournament.matches.values() if m.round_num == num_rounds)
+    key = (guild_id, tournament.name, tournament.size, tournament.creator_id)
     
-    # Draw title
-    title = f"{tournament.name} Tournament"
-    draw.text((PADDING, PADDING), title, fill=(0, 0, 0), font=title_font)
-    
-    # Draw brackets round by round
-    async with aiohttp.ClientSession() as session:
-        # Organize matches by round
-        matches_by_round = {}
-        for match in tournament.matches.values():
-            if match.round_num not in matches_by_round:
-                matches_by_round[match.round_num] = []
+    if region is not None or view == "region":
+        region = region or 1
+        region_count = bracket_region_count(tournament)
+        if not 1 <= region <= region_count:
+            raise ValueError(f"Region must be between 1 and {region_count}.")
+        
+        # Find the stage of the region, then the match its winner comes out of
+        index = region
+        for last_round in range(REGION_ROUNDS, num_rounds + REGION_ROUNDS, REGION_ROUNDS):
+            last_round = min(last_round, num_rounds)
+            regions_in_stage = 2 ** (num_rounds - last_round)
+            if index <= regions_in_stage:
+                break
+            index -= regions_in_stage
+        root = next(m for m in tournament.matches.values() if m.round_num == last_round and m.position == index)
+        first_round = max(1, last_round - REGION_ROUNDS + 1)
+        return BracketPage(key + ("region", region),
+                           f"{tournament.name} Tournament - Region {region} (rounds {first_round}-{last_round})",
+                           root.match_id, first_round, FULL_STYLE)
+    
+    if view == "auto" and num_rounds <= FULL_BRACKET_MAX_ROUNDS:
+        return BracketPage(key + ("full",), f"{tournament.name} Tournament", final.match_id, 1, FULL_STYLE)
+    
+    first_round = max(1, num_rounds - OVERVIEW_ROUNDS + 1)
+    title = f"{tournament.name} Tournament - Overview"
+    if first_round > 1:
+        title += f" (rounds {first_round}-{num_rounds})"
+    return BracketPage(key + ("overview",), title, final.match_id, first_round, COMPACT_STYLE)
+
+def _page_matches(tournament: Tournament, page: BracketPage) -> Dict[int, List[Match]]:
+    """Get the matches drawn on a page by round, sorted by position."""
+    root = tournament.matches[page.root_match_id]
+    matches_by_round = {round_num: [] for round_num in range(page.first_round, root.round_num + 1)}
+    for match in tournament.matches.values():
+        if match.round_num not in matches_by_round:
+            continue
+        # The matches that feed into the root match
+        span = 2 ** (root.round_num - match.round_num)
+        if (match.position - 1) // span + 1 == root.position:
             matches_by_round[match.round_num].append(match)
+    
+    for matches in matches_by_round.values():
+        matches.sort(key=lambda m: m.position)
+    return matches_by_round
+
+async def generate_bracket_image(tournament: Tournament, guild_id: int, view: str = "auto",
+                                 region: Optional[int] = None) -> io.BytesIO:
+    """Generate an image visualization of the tournament bracket. See get_bracket_page for the views."""
+    page = get_bracket_page(tournament, guild_id, view, region)
+    
+    # Snapshot the page before anything is awaited, so the image shows the bracket as it was requested
+    matches_by_round = {
+        round_num: [_snapshot_match(match) for match in matches]
+        for round_num, matches in _page_matches(tournament, page).items()
+    }
+    
+    # Get the avatars of everyone on the page up front, each one only once
+    avatars = {}
+    if page.style.avatars:
+        avatars = await get_avatars(
+            (participant.avatar_url
+             for matches in matches_by_round.values()
+             for match in matches
+             for participant in (match.participant1, match.participant2) if participant),
+            AVATAR_SIZE
+        )
+
+    # Draw the bracket in the render pool
+    return io.BytesIO(await render(draw_bracket_image, matches_by_round, avatars, page))
+
+def _bracket_layout(matches_by_round: Dict[int, List[MatchSnapshot]], page: BracketPage) -> Tuple[int, int, Dict[int, List[MatchSnapshot]], Dict[int, Tuple[float, float]]]:
+    """Get the image size, the matches of every round and the position of every match box on a page."""
+    style = page.style
+    
+    # Calculate image dimensions, the page is a complete part of the bracket so its first round is the largest
+    num_rounds = len(matches_by_round)
+    max_matches_in_round = len(matches_by_round[page.first_round])
+    image_width = (num_rounds * (style.match_width + style.round_spacing)) + PADDING * 2
+    image_height = style.header_height + (max_matches_in_round * (style.match_height + style.match_spacing)) + PADDING * 2
+    
+    positions = {}
+    for round_num, matches in matches_by_round.items():
+        x = PADDING + (round_num - page.first_round) * (style.match_width + style.round_spacing)
+            
+        # Calculate spacing for this round
+        total_height_needed = len(matches) * style.match_height + (len(matches) - 1) * style.match_spacing
+        first_match_y = style.header_height + (image_height - style.header_height - total_height_needed) / 2
+        for i, match in enumerate(matches):
+            positions[match.match_id] = (x, first_match_y + i * (style.match_height + style.match_spacing))
+    
+    return image_width, image_height, matches_by_round, positions
+
+def _draw_bracket_base(layout, page: BracketPage) -> Image.Image:
+    """Draw everything that doesn't change during a tournament: the background, title and connectors."""
+    image_width, image_height, matches_by_round, positions = layout
+    style = page.style
+    
+    # Create base image, without alpha channel as the bracket is fully opaque (which makes it faster to encode)
+    image = get_canvas('RGB', (image_width, image_height), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    
+    # Draw title
+    draw.text((PADDING, PADDING), page.title, fill=(0, 0, 0), font=get_font(24))
+    
+    # Draw connectors to the next match
+    connector_color = (100, 100, 100)
+    for match in (m for matches in matches_by_round.values() for m in matches):
+        x, y = positions[match.match_id]
+        if match.next_match_id not in positions:
+            # The winner continues on another page
+            if match.next_match_id:
+                draw.text((int(x + style.match_width + 10), int(y + style.match_height/2 - 7)),
+                          f"-> #{match.next_match_id}", fill=connector_color, font=get_font(12))
+            continue
+        next_x, next_y = positions[match.next_match_id]
+            
+        # Draw horizontal line from match to middle
+        mid_x = x + style.match_width + style.round_spacing/2
+        mid_y = y + style.match_height/2
         
-        # Sort matches within each round
-        for round_num in matches_by_round:
-            matches_by_round[round_num].sort(key=lambda m: m.position)
+        # For top matches, connect from bottom, for bottom matches, connect from top
+        if match.position % 2 == 1:
+            end_y = next_y + style.match_height/4
+        else:
+            end_y = next_y + 3*style.match_height/4
+        draw.line([(int(x + style.match_width), int(mid_y)), (int(mid_x), int(mid_y)), 
+                  (int(mid_x), int(end_y)), (int(next_x), int(end_y))], 
+                 fill=connector_color, width=CONNECTOR_WIDTH)
+    
+    return image
+
+def _participant_state(participant: Optional[ParticipantSnapshot], avatars: Dict[str, Optional[bytes]]) -> Optional[tuple]:
+    if participant is None:
+        return None
+    return (participant.user_id, participant.display_name, participant.avatar_url,
+            avatars.get(participant.avatar_url) is not None)
+
+def _match_state(match: MatchSnapshot, avatars: Dict[str, Optional[bytes]], style: BracketStyle) -> tuple:
+    """Everything that is shown in a match box. Boxes with the same state look the same."""
+    return (
+        style.name,
+        match.match_id,
+        match.completed,
+        match.winner_id,
+        _participant_state(match.participant1, avatars),
+        _participant_state(match.participant2, avatars)
+    )
+
+def _draw_match_tile(match: MatchSnapshot, avatars: Dict[str, Optional[bytes]], name_font) -> Image.Image:
+    """Draw a single match box."""
+    tile = get_canvas('RGB', (MATCH_WIDTH + 1, MATCH_HEIGHT + 1), (255, 255, 255))
+    draw = ImageDraw.Draw(tile)
+    
+    # Draw match box
+    box_color = (220, 220, 220)
+    if match.completed:
+        box_color = (200, 240, 200)  # Green tint for completed matches
+    draw.rectangle([(0, 0), (MATCH_WIDTH, MATCH_HEIGHT)], fill=box_color, outline=(0, 0, 0))
+    
+    # Draw both participants, the first at the top and the second at the bottom of the box
+    for participant, top in ((match.participant1, True), (match.participant2, False)):
+        if not participant:
+            continue
         
-        # Draw each round
-        for round_num in range(1, num_rounds + 1):
-            matches = matches_by_round.get(round_num, [])
-            matches_in_round = len(matches)
+        # Decode the avatar
+        avatar_img = None
+        avatar_data = avatars.get(participant.avatar_url)
+        try:
+            if avatar_data:
+                avatar_img = Image.open(io.BytesIO(avatar_data)).convert('RGBA')
+        except Exception:
+            pass
             
-            x = PADDING + (round_num - 1) * (MATCH_WIDTH + ROUND_SPACING)
+        # Draw avatar if available
+        if avatar_img:
+            avatar_y = 10 if top else MATCH_HEIGHT - AVATAR_SIZE - 10
+            tile.paste(avatar_img, (10, avatar_y), avatar_img)
+                
+        # Draw name
+        name = participant.display_name
+        if len(name) > 15:
+            name = name[:12] + "..."
+        draw.text((AVATAR_SIZE + 15, 15 if top else MATCH_HEIGHT - 25), name, fill=(0, 0, 0), font=name_font)
+            
+        # Indicate winner
+        if match.winner_id == participant.user_id:
+            if top:
+                draw.polygon([(5, 5), (15, 5), (10, 15)], fill=(0, 200, 0))
+            else:
+                draw.polygon([(5, MATCH_HEIGHT - 15), (15, MATCH_HEIGHT - 15), (10, MATCH_HEIGHT - 5)], fill=(0, 200, 0))
+        
+    # Draw match ID
+    draw.text((MATCH_WIDTH - 20, MATCH_HEIGHT - 15), f"#{match.match_id}", fill=(150, 150, 150), font=name_font)
+    
+    return tile
+
+def _draw_compact_tile(match: MatchSnapshot, name_font) -> Image.Image:
+    """Draw a single match box of the overview: two names and the match ID, without avatars."""
+    width, height = COMPACT_STYLE.match_width, COMPACT_STYLE.match_height
+    tile = get_canvas('RGB', (width + 1, height + 1), (255, 255, 255))
+    draw = ImageDraw.Draw(tile)
+    
+    box_color = (200, 240, 200) if match.completed else (220, 220, 220)
+    draw.rectangle([(0, 0), (width, height)], fill=box_color, outline=(0, 0, 0))
+    
+    for participant, y in ((match.participant1, 3), (match.participant2, height // 2 + 2)):
+        name = participant.display_name if participant else "TBD"
+        if len(name) > 14:
+            name = name[:11] + "..."
+        is_winner = participant is not None and match.winner_id == participant.user_id
+        draw.text((6, y), name, fill=(0, 130, 0) if is_winner else (0, 0, 0), font=name_font)
+    
+    # Draw match ID
+    draw.text((width - 32, height // 2 - 6), f"#{match.match_id}", fill=(150, 150, 150), font=name_font)
+    
+    return tile
+
+def draw_bracket_image(matches_by_round: Dict[int, List[MatchSnapshot]], avatars: Dict[str, Optional[bytes]],
+                       page: BracketPage) -> bytes:
+    """
+    Draw a page of the tournament bracket from snapshots of its matches by round and already downloaded
+    and resized avatars, returns the PNG bytes.
+    
+    The last drawn image of every page is kept, together with the state of each match box.
+    Only the boxes that changed since then are drawn and pasted again, so recording a result redraws
+    a single match instead of the whole bracket.
+    """
+    layout = _bracket_layout(matches_by_round, page)
+    image_width, image_height, matches_by_round, positions = layout
+    
+    with _bracket_cache_lock:
+        cached = bracket_composite_cache.get(page.key)
+        if cached is None or cached['image'].size != (image_width, image_height):
+            cached = {'image': _draw_bracket_base(layout, page), 'tiles': {}}
+        image, drawn_tiles = cached['image'], cached['tiles']
+        name_font = get_font(14 if page.style.avatars else 12)
+        
+        for match in (m for matches in matches_by_round.values() for m in matches):
+            state = _match_state(match, avatars, page.style)
+            if drawn_tiles.get(match.match_id) == state:
+                continue
             
-            # Calculate spacing for this round
-            total_height_needed = matches_in_round * MATCH_HEIGHT + (matches_in_round - 1) * MATCH_SPACING
-            first_match_y = (image_height - total_height_needed) / 2
+            tile = bracket_tile_cache.get(state)
+            if tile is None:
+                if page.style.avatars:
+                    tile = _draw_match_tile(match, avatars, name_font)
+                else:
+                    tile = _draw_compact_tile(match, name_font)
+                bracket_tile_cache.set(state, tile)
             
-            for i, match in enumerate(matches):
-                y = first_match_y + i * (MATCH_HEIGHT + MATCH_SPACING)
-                
-                # Draw match box
-                box_color = (220, 220, 220)
-                if match.completed:
-                    box_color = (200, 240, 200)  # Green tint for completed matches
-                draw.rectangle([(int(x), int(y)), (int(x + MATCH_WIDTH), int(y + MATCH_HEIGHT))], fill=box_color, outline=(0, 0, 0))
-                
-                # Draw participant 1
-                if match.participant1:
-                    # Try to download avatar
-                    avatar_img = None
-                    try:
-                        async with session.get(match.participant1.avatar_url) as resp:
-                            if resp.status == 200:
-                                avatar_data = await resp.read()
-                                avatar_img = Image.open(io.BytesIO(avatar_data)).convert('RGBA')
-                                avatar_img = avatar_img.resize((AVATAR_SIZE, AVATAR_SIZE))
-                    except Exception:
-                        pass
-                    
-                    # Draw avatar if available
-                    if avatar_img:
-                        image.paste(avatar_img, (int(x + 10), int(y + 10)), avatar_img)
-                        
-                    # Draw name
-                    name = match.participant1.display_name
-                    if len(name) > 15:
-                        name = name[:12] + "..."
-                    draw.text((int(x + AVATAR_SIZE + 15), int(y + 15)), name, fill=(0, 0, 0), font=name_font)
-                    
-                    # Indicate winner
-                    if match.winner and match.winner.user_id == match.participant1.user_id:
-                        draw.polygon([(int(x + 5), int(y + 5)), (int(x + 15), int(y + 5)), 
-                                     (int(x + 10), int(y + 15))], fill=(0, 200, 0))
-                
-                # Draw participant 2
-                if match.participant2:
-                    # Try to download avatar
-                    avatar_img = None
-                    try:
-                        async with session.get(match.participant2.avatar_url) as resp:
-                            if resp.status == 200:
-                                avatar_data = await resp.read()
-                                avatar_img = Image.open(io.BytesIO(avatar_data)).convert('RGBA')
-                                avatar_img = avatar_img.resize((AVATAR_SIZE, AVATAR_SIZE))
-                    except Exception:
-                        pass
-                    
-                    # Draw avatar if available
-                    if avatar_img:
-                        image.paste(avatar_img, (int(x + 10), int(y + MATCH_HEIGHT - AVATAR_SIZE - 10)), avatar_img)
-                        
-                    # Draw name
-                    name = match.participant2.display_name
-                    if len(name) > 15:
-                        name = name[:12] + "..."
-                    draw.text((int(x + AVATAR_SIZE + 15), int(y + MATCH_HEIGHT - 25)), name, fill=(0, 0, 0), font=name_font)
-                    
-                    # Indicate winner
-                    if match.winner and match.winner.user_id == match.participant2.user_id:
-                        draw.polygon([(int(x + 5), int(y + MATCH_HEIGHT - 15)), (int(x + 15), int(y + MATCH_HEIGHT - 15)), 
-                                    (int(x + 10), int(y + MATCH_HEIGHT - 5))], fill=(0, 200, 0))
-                
-                # Draw match ID
-                draw.text((int(x + MATCH_WIDTH - 20), int(y + MATCH_HEIGHT - 15)), f"#{match.match_id}", 
-                          fill=(150, 150, 150), font=name_font)
-                
-                # Draw connector to next match if not in final round
-                if match.next_match_id and round_num < num_rounds:
-                    next_match = tournament.matches[match.next_match_id]
-                    next_matches = matches_by_round.get(round_num + 1, [])
-                    next_match_index = next(i for i, m in enumerate(next_matches) if m.match_id == next_match.match_id)
-                    
-                    next_x = x + MATCH_WIDTH + ROUND_SPACING
-                    next_total_height = len(next_matches) * MATCH_HEIGHT + (len(next_matches) - 1) * MATCH_SPACING
-                    next_first_y = (image_height - next_total_height) / 2
-                    next_y = next_first_y + next_match_index * (MATCH_HEIGHT + MATCH_SPACING)
-                    
-                    # Draw horizontal line from match to middle
-                    mid_x = x + MATCH_WIDTH + ROUND_SPACING/2
-                    connector_color = (100, 100, 100)
-                    
-                    # For top matches, connect from bottom
-                    if match.position % 2 == 1:
-                        mid_y = y + MATCH_HEIGHT/2
-                        end_y = next_y + MATCH_HEIGHT/4
-                        draw.line([(int(x + MATCH_WIDTH), int(mid_y)), (int(mid_x), int(mid_y)), 
-                                  (int(mid_x), int(end_y)), (int(next_x), int(end_y))], 
-                                 fill=connector_color, width=CONNECTOR_WIDTH)
-                    # For bottom matches, connect from top
-                    else:
-                        mid_y = y + MATCH_HEIGHT/2
-                        end_y = next_y + 3*MATCH_HEIGHT/4
-                        draw.line([(int(x + MATCH_WIDTH), int(mid_y)), (int(mid_x), int(mid_y)), 
-                                  (int(mid_x), int(end_y)), (int(next_x), int(end_y))], 
-                                 fill=connector_color, width=CONNECTOR_WIDTH)
-    
-    # Save image to BytesIO
-    output = io.BytesIO()
-    image.save(output, format='PNG')
-    output.seek(0)
+            x, y = positions[match.match_id]
+            image.paste(tile, (int(x), int(y)))
+            drawn_tiles[match.match_id] = state
+        
+        bracket_composite_cache.set(page.key, cached)
+        
+        # Encode a copy, so the next render can update the bracket while this one is being saved
+        image = image.copy()
     
-    return output
+    # Save image to PNG bytes. Encoding dominates the render time of large brackets, and the flat
+    # colors of a bracket compress well even at the fastest level.
+    output = io.BytesIO()
+    image.save(output, format='PNG', compress_level=1)
+    return output.getvalue()
 
 def get_tournament(guild_id: int, tournament_name: str) -> Optional[Tournament]:
     """Get a tournament by guild ID and name."""
@@ -606,8 +845,8 @@ def create_tournament(guild_id: int, tournament_name: str, size: int, creator_id
     # Validate tournament size
     if size < 2:
         return False, "Tournament size must be at least 2."
-    if size > 64:
-        return False, "Tournament size cannot exceed 64."
+    if size > MAX_TOURNAMENT_SIZE:
+        return False, f"Tournament size cannot exceed {MAX_TOURNAMENT_SIZE}."
     
     # Create tournament
     tournament = Tournament(tournament_name, size, creator_id)
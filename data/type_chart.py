@@ -0,0 +1,116 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+from data.pokemon import ALL_POKEMON_TYPES
+
+# Attacking type -> {defending type: multiplier}, only for non-neutral matchups (Gen 6+ chart)
+TYPE_EFFECTIVENESS = {
+    "normal": {"rock": 0.5, "ghost": 0.0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2.0, "ice": 2.0, "bug": 2.0, "rock": 0.5, "dragon": 0.5, "steel": 2.0},
+    "water": {"fire": 2.0, "water": 0.5, "grass": 0.5, "ground": 2.0, "rock": 2.0, "dragon": 0.5},
+    "electric": {"water": 2.0, "electric": 0.5, "grass": 0.5, "ground": 0.0, "flying": 2.0, "dragon": 0.5},
+    "grass": {"fire": 0.5, "water": 2.0, "grass": 0.5, "poison": 0.5, "ground": 2.0, "flying": 0.5, "bug": 0.5,
+              "rock": 2.0, "dragon": 0.5, "steel": 0.5},
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2.0, "ice": 0.5, "ground": 2.0, "flying": 2.0, "dragon": 2.0, "steel": 0.5},
+    "fighting": {"normal": 2.0, "ice": 2.0, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5, "rock": 2.0,
+                 "ghost": 0.0, "dark": 2.0, "steel": 2.0, "fairy": 0.5},
+    "poison": {"grass": 2.0, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0.0, "fairy": 2.0},
+    "ground": {"fire": 2.0, "electric": 2.0, "grass": 0.5, "poison": 2.0, "flying": 0.0, "bug": 0.5, "rock": 2.0, "steel": 2.0},
+    "flying": {"electric": 0.5, "grass": 2.0, "fighting": 2.0, "bug": 2.0, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fighting": 2.0, "poison": 2.0, "psychic": 0.5, "dark": 0.0, "steel": 0.5},
+    "bug": {"fire": 0.5, "grass": 2.0, "fighting": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2.0, "ghost": 0.5,
+            "dark": 2.0, "steel": 0.5, "fairy": 0.5},
+    "rock": {"fire": 2.0, "ice": 2.0, "fighting": 0.5, "ground": 0.5, "flying": 2.0, "bug": 2.0, "steel": 0.5},
+    "ghost": {"normal": 0.0, "psychic": 2.0, "ghost": 2.0, "dark": 0.5},
+    "dragon": {"dragon": 2.0, "steel": 0.5, "fairy": 0.0},
+    "dark": {"fighting": 0.5, "psychic": 2.0, "ghost": 2.0, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2.0, "rock": 2.0, "steel": 0.5, "fairy": 2.0},
+    "fairy": {"fire": 0.5, "fighting": 2.0, "poison": 0.5, "dragon": 2.0, "dark": 2.0, "steel": 0.5},
+}
+
+# Position of each type in the matrix rows and columns
+TYPE_INDEX = {type_name: i for i, type_name in enumerate(ALL_POKEMON_TYPES)}
+
+# 18x18 multiplier matrix: TYPE_CHART[attacking type index][defending type index]
+TYPE_CHART: Tuple[Tuple[float, ...], ...] = tuple(
+    tuple(TYPE_EFFECTIVENESS[attacking].get(defending, 1.0) for defending in ALL_POKEMON_TYPES)
+    for attacking in ALL_POKEMON_TYPES
+)
+
+# The same matrix transposed, so a defending type's multipliers against every attacking type are one row
+DEFENSE_ROWS: Tuple[Tuple[float, ...], ...] = tuple(zip(*TYPE_CHART))
+
+NEUTRAL_ROW: Tuple[float, ...] = (1.0,) * len(ALL_POKEMON_TYPES)
+
+@lru_cache(maxsize=None)
+def _defense_row(types: Tuple[str, ...]) -> Tuple[float, ...]:
+    """Element-wise product of the defense rows of the given types."""
+    row = NEUTRAL_ROW
+    for type_name in types:
+        index = TYPE_INDEX.get(type_name)
+        if index is None:
+            continue  # Unknown type, treat as neutral
+        row = tuple(a * b for a, b in zip(row, DEFENSE_ROWS[index]))
+    return row
+
+def get_defense_row(types: Iterable[str]) -> Tuple[float, ...]:
+    """
+    Get the damage multipliers of every attacking type against a single or dual type Pokémon,
+    in the order of ALL_POKEMON_TYPES.
+    """
+    return _defense_row(tuple(sorted(t.lower() for t in types)))
+
+def get_damage_multipliers(types: Iterable[str]) -> Dict[str, float]:
+    """Get a dictionary of attacking type -> damage multiplier against a Pokémon with the given types."""
+    return dict(zip(ALL_POKEMON_TYPES, get_defense_row(types)))
+
+def get_effectiveness(attacking_type: str, defending_types: Iterable[str]) -> float:
+    """Get the damage multiplier of one attacking type against a Pokémon with the given types."""
+    index = TYPE_INDEX.get(attacking_type.lower())
+    if index is None:
+        return 1.0
+    return get_defense_row(defending_types)[index]
+
+def get_super_effective_types(attacking_type: str) -> List[str]:
+    """Get the defending types an attacking type deals double damage to."""
+    index = TYPE_INDEX.get(attacking_type.lower())
+    if index is None:
+        return []
+    return [ALL_POKEMON_TYPES[i] for i, m in enumerate(TYPE_CHART[index]) if m >= 2.0]
+
+def get_team_matchups(team_types: List[List[str]]) -> Dict[str, Any]:
+    """
+    Analyse the type matchups of a whole team (up to 6 Pokémon) in one pass over the type chart.
+
+    Returns:
+        Dict[str, Any]: {
+            'matchups': {attacking type: {'weak': n, 'resist': n, 'immune': n}},
+            'weaknesses': attacking types more team members are weak to than resist,
+            'resistances': attacking types more team members resist than are weak to,
+            'unresisted': attacking types no team member resists or is immune to,
+            'coverage_gaps': defending types none of the team's own types hit super effectively
+        }
+    """
+    rows = [get_defense_row(types) for types in team_types]
+
+    matchups = {}
+    for i, attacking_type in enumerate(ALL_POKEMON_TYPES):
+        column = [row[i] for row in rows]
+        matchups[attacking_type] = {
+            'weak': sum(1 for m in column if m >= 2.0),
+            'resist': sum(1 for m in column if 0.0 < m < 1.0),
+            'immune': sum(1 for m in column if m == 0.0)
+        }
+
+    # Offensive coverage, assuming every member attacks with its own types
+    team_attacking_types = {t.lower() for types in team_types for t in types if t.lower() in TYPE_INDEX}
+    covered = set()
+    for attacking_type in team_attacking_types:
+        covered.update(get_super_effective_types(attacking_type))
+
+    return {
+        'matchups': matchups,
+        'weaknesses': [t for t, m in matchups.items() if m['weak'] > m['resist'] + m['immune']],
+        'resistances': [t for t, m in matchups.items() if m['resist'] + m['immune'] > m['weak']],
+        'unresisted': [t for t, m in matchups.items() if m['resist'] + m['immune'] == 0],
+        'coverage_gaps': [t for t in ALL_POKEMON_TYPES if t not in covered]
+    }
@@ -0,0 +1,130 @@
+"""
+Benchmarks the "did you mean" suggestions of the name index as the number of names grows.
+
+Names are generated to look like Pokémon names: a fixed number of species, plus a growing number of
+forms and regional variants. Every query is a misspelled version of a known name. A linear scan over
+all names is timed for comparison. The number of names scored per query is checked against the bound
+the index guarantees, CANDIDATE_TRIGRAMS * MAX_CANDIDATES_PER_TRIGRAM.
+
+The queries of every size are drawn from that size's names, so longer form names make up more of them as
+forms are added. To compare sizes, the same misspelled species names are also timed at every size
+(best of a few runs), and that time may grow at most MAX_GROWTH times from the smallest to the largest size.
+
+    python -m scripts.bench_name_index
+    python -m scripts.bench_name_index --species 1025 --forms 0 1000 10000 --queries 500
+"""
+import argparse
+import random
+import time
+from data import name_index
+
+CONSONANTS = ["b", "c", "ch", "d", "dr", "f", "g", "gr", "k", "l", "m", "n", "p", "r", "s", "sh", "sq",
+              "t", "tr", "v", "w", "z"]
+VOWELS = ["a", "e", "i", "o", "u", "ee", "oo", "y"]
+ENDINGS = ["", "", "n", "r", "x", "l", "s", "rd", "mp", "ng"]
+FORMS = ["alola", "galar", "hisui", "paldea", "mega", "mega-x", "mega-y", "gmax", "totem", "origin",
+         "starter", "cap", "cosplay", "crowned", "eternamax", "therian"]
+
+def generate_species(count: int, rng: random.Random) -> list:
+    """Generate unique Pokémon-like species names."""
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(ENDINGS)
+                          for _ in range(rng.randint(2, 3))))
+    return sorted(names)
+
+def add_forms(species: list, count: int, rng: random.Random) -> dict:
+    """Get the species names plus `count` unique forms of them."""
+    names = {name: i + 1 for i, name in enumerate(species)}
+    count = min(count, len(species) * len(FORMS))
+    while len(names) < len(species) + count:
+        names.setdefault(f"{rng.choice(species)}-{rng.choice(FORMS)}", len(names) + 1)
+    return names
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Drop, swap or replace one character of a name."""
+    i = rng.randrange(len(name))
+    action = rng.choice(["drop", "swap", "replace"])
+    if action == "drop":
+        return name[:i] + name[i + 1:]
+    if action == "swap" and i < len(name) - 1:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1:]
+
+# Allowed growth of the fixed query time from the smallest to the largest size. Small indexes have fewer names
+# to take candidates from, beyond a few thousand names every query hits the candidate bound and the time stops growing.
+MAX_GROWTH = 3.0
+
+# Runs of the fixed queries per size, the fastest one counts
+FIXED_REPEATS = 5
+
+def linear_suggest(query: str, names: list, k: int = 3) -> list:
+    """Score every name, what a lookup costs without the index."""
+    return sorted(names, key=lambda name: name_index.similarity(query, name), reverse=True)[:k]
+
+def bench(species_count: int, form_counts: list, query_count: int, linear_limit: int, seed: int):
+    rng = random.Random(seed)
+    species = generate_species(species_count, rng)
+    max_scored = name_index.CANDIDATE_TRIGRAMS * name_index.MAX_CANDIDATES_PER_TRIGRAM
+    fixed_queries = [misspell(name, rng) for name in rng.sample(species, min(query_count, len(species)))]
+    fixed_times = []
+    print(f"{'names':>8} {'build ms':>10} {'index µs/query':>15} {'fixed µs/query':>15} {'linear µs/query':>16} "
+          f"{'top-3 hit':>10} {'max scored':>11}")
+    for form_count in form_counts:
+        names = add_forms(species, form_count, rng)
+        size = len(names)
+        name_index.build_index(names, {}, complete=True)
+        targets = rng.sample(list(names), min(query_count, len(names)))
+        queries = [misspell(name, rng) for name in targets]
+
+        # The trigram index is built lazily on the first suggestion
+        start = time.perf_counter()
+        name_index.suggest("warmup")
+        build_ms = (time.perf_counter() - start) * 1000
+
+        hits = 0
+        start = time.perf_counter()
+        for query, target in zip(queries, targets):
+            hits += target in name_index.suggest(query)
+        index_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        fixed_us = float("inf")
+        for _ in range(FIXED_REPEATS):
+            start = time.perf_counter()
+            for query in fixed_queries:
+                name_index.suggest(query)
+            fixed_us = min(fixed_us, (time.perf_counter() - start) / len(fixed_queries) * 1e6)
+        fixed_times.append(fixed_us)
+
+        scored = max(len(name_index.get_candidates(query)) for query in queries)
+        assert scored <= max_scored, f"{scored} names scored for one query, the bound is {max_scored}"
+
+        linear = "skipped"
+        if size <= linear_limit:
+            sample = queries[:50]
+            start = time.perf_counter()
+            for query in sample:
+                linear_suggest(query, list(names))
+            linear = f"{(time.perf_counter() - start) / len(sample) * 1e6:.0f}"
+
+        print(f"{size:>8} {build_ms:>10.1f} {index_us:>15.1f} {fixed_us:>15.1f} {linear:>16} "
+              f"{hits / len(queries):>10.0%} {scored:>11}")
+
+    growth = fixed_times[-1] / fixed_times[0]
+    print(f"Fixed query time grew {growth:.1f}x from {len(species)} to {size} names")
+    assert growth <= MAX_GROWTH, f"Lookup time grew {growth:.1f}x with the number of names, the limit is {MAX_GROWTH}x"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzy Pokémon name suggestions.")
+    parser.add_argument("--species", type=int, default=1025, help="Number of species")
+    parser.add_argument("--forms", type=int, nargs="+", default=[0, 300, 1000, 3000, 10000],
+                        help="Numbers of forms and regional variants to add to the species")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of misspelled queries per size")
+    parser.add_argument("--linear-limit", type=int, default=5000, help="Largest size to time the linear scan for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bench(args.species, args.forms, args.queries, args.linear_limit, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmarks the NumPy sprite effects against the previous PIL implementation.
+
+Runs on the real sprite set, so download it first with scripts/prerender_sprites.py:
+
+    python -m scripts.bench_sprite_effects
+    python -m scripts.bench_sprite_effects --variant shiny --repeat 5
+
+Every effect is timed twice: the effect alone on an already decoded sprite, and the full
+PNG bytes -> PNG bytes render that the minigames use.
+"""
+import argparse
+import glob
+import io
+import os
+import time
+from PIL import Image
+from data import sprite_effects
+from data.sprites import SPRITE_DIR
+
+def pil_silhouette(img: Image.Image) -> Image.Image:
+    """Silhouette as it was rendered before the NumPy effects."""
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    silhouette = Image.new('RGBA', img.size, color='black')
+    if 'A' in img.getbands():
+        silhouette.putalpha(img.getchannel('A'))
+    else:
+        gray = img.convert('L')
+        silhouette.putalpha(gray.point(lambda p: 255 if p > 3 else 0))
+    return silhouette
+
+def pil_pixelate(img: Image.Image, size: int = 6) -> Image.Image:
+    """Pixelation as it was rendered before the NumPy effects."""
+    return img.resize((size, size)).resize(img.size, Image.NEAREST)
+
+def pil_render(func, image_data: bytes) -> bytes:
+    output = io.BytesIO()
+    func(Image.open(io.BytesIO(image_data))).save(output, format='PNG')
+    return output.getvalue()
+
+def numpy_render(func, image_data: bytes) -> bytes:
+    return sprite_effects.encode(func(sprite_effects.decode(image_data)))
+
+def time_per_sprite(func, items: list, repeat: int) -> float:
+    """Average time of func over all items, in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+def bench(sprite_dir: str, repeat: int):
+    paths = sorted(glob.glob(os.path.join(sprite_dir, '*.png')))
+    if not paths:
+        print(f"No sprites found in {sprite_dir}, run scripts/prerender_sprites.py first.")
+        return
+
+    sprites = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            sprites.append(f.read())
+    images = [Image.open(io.BytesIO(data)) for data in sprites]
+    for img in images:
+        img.load()
+    arrays = [sprite_effects.decode(data) for data in sprites]
+
+    effects = [
+        ("silhouette", pil_silhouette, sprite_effects.silhouette),
+        ("pixelate", pil_pixelate, sprite_effects.pixelate),
+    ]
+    print(f"{len(sprites)} sprites from {sprite_dir}, {repeat} runs")
+    print(f"{'effect':<12} {'PIL µs':>10} {'NumPy µs':>10} {'PIL render µs':>15} {'NumPy render µs':>16}")
+    for name, pil_func, numpy_func in effects:
+        pil_effect = time_per_sprite(pil_func, images, repeat)
+        numpy_effect = time_per_sprite(numpy_func, arrays, repeat)
+        pil_full = time_per_sprite(lambda data: pil_render(pil_func, data), sprites, repeat)
+        numpy_full = time_per_sprite(lambda data: numpy_render(numpy_func, data), sprites, repeat)
+        print(f"{name:<12} {pil_effect:>10.1f} {numpy_effect:>10.1f} {pil_full:>15.1f} {numpy_full:>16.1f}")
+
+    # Effects without a PIL counterpart, for reference
+    for name, numpy_func in [("outline", sprite_effects.outline), ("blur", sprite_effects.blur),
+                             ("reveal", sprite_effects.partial_reveal)]:
+        numpy_effect = time_per_sprite(numpy_func, arrays, repeat)
+        numpy_full = time_per_sprite(lambda data: numpy_render(numpy_func, data), sprites, repeat)
+        print(f"{name:<12} {'-':>10} {numpy_effect:>10.1f} {'-':>15} {numpy_full:>16.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sprite effects against the old PIL implementation.")
+    parser.add_argument("--variant", default="default", help="Sprite variant to benchmark on")
+    parser.add_argument("--sprite-dir", help="Directory with PNG sprites (default: the downloaded sprites of the variant)")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs over the sprite set")
+    args = parser.parse_args()
+
+    bench(args.sprite_dir or os.path.join(SPRITE_DIR, args.variant), args.repeat)
+
+if __name__ == "__main__":
+    main()
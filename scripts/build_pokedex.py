@@ -0,0 +1,45 @@
+"""
+Builds the bundled Pokédex dataset (data/pokedex.json.gz) from PokeAPI.
+
+The bot builds it by itself on its first start, run this from the repository root to refresh it
+whenever new Pokémon are released:
+
+    python -m scripts.build_pokedex
+    python -m scripts.build_pokedex --limit 151 --concurrency 5
+"""
+import argparse
+import asyncio
+from data import pokedex
+from data.http_client import close_http_session
+from data.pokeapi_cache import pokeapi_cache
+
+async def build(limit: int, concurrency: int, output: str):
+    try:
+        # Start from a clean slate, so a refresh doesn't keep entries that were fetched on demand
+        pokedex.pokemon_entries.clear()
+        pokedex.pokemon_names.clear()
+        pokedex.evolution_chains.clear()
+        pokedex.all_pokemon_names.clear()
+
+        if not await pokedex.build_pokedex(limit, concurrency):
+            return
+
+        pokedex.save_pokedex(output)
+        print(f"Saved {len(pokedex.pokemon_entries)} Pokémon, {len(pokedex.evolution_chains)} evolution chains "
+              f"and {len(pokedex.all_pokemon_names)} names to {output}")
+    finally:
+        await close_http_session()
+        await pokeapi_cache.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the bundled Pokédex dataset from PokeAPI.")
+    parser.add_argument("--limit", type=int, default=0, help="Number of Pokémon to include (default: all species)")
+    parser.add_argument("--concurrency", type=int, default=pokedex.BUILD_CONCURRENCY,
+                        help="Number of parallel requests to PokeAPI")
+    parser.add_argument("--output", default=pokedex.POKEDEX_FILE, help="Where to write the dataset")
+    args = parser.parse_args()
+
+    asyncio.run(build(args.limit, args.concurrency, args.output))
+
+if __name__ == "__main__":
+    main()
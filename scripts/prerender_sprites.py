@@ -0,0 +1,68 @@
+"""
+Downloads the sprites of all Pokémon and pre-renders the minigame silhouettes and pixelations,
+so starting a minigame never has to download or render anything.
+
+Run it from the repository root after building the Pokédex dataset:
+
+    python -m scripts.prerender_sprites
+    python -m scripts.prerender_sprites --limit 151 --concurrency 10
+"""
+import argparse
+import asyncio
+from data import pokedex
+from data.sprites import get_sprite_entry
+from data.sprite_assets import get_derived_sprite
+from data.http_client import close_http_session
+
+# Rendered sprites used by the minigames: (transform, params)
+MINIGAME_ASSETS = [
+    ("silhouette", {}),
+    ("pixelate", {"size": 6}),
+]
+
+# Number of Pokémon species, used when the Pokédex dataset hasn't been built
+DEFAULT_LIMIT = 1025
+
+async def prerender_pokemon(pokemon_id: int, sprite_url: str, semaphore: asyncio.Semaphore) -> bool:
+    """Download the sprite of a single Pokémon and render its minigame assets."""
+    async with semaphore:
+        sprite = await get_sprite_entry(pokemon_id, url=sprite_url)
+        if sprite is None:
+            print(f"Skipping Pokémon #{pokemon_id}: no sprite available")
+            return False
+
+        for transform, params in MINIGAME_ASSETS:
+            await get_derived_sprite(pokemon_id, transform, url=sprite_url, **params)
+        return True
+
+async def prerender(limit: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Use the sprite URLs of the dataset where possible, forms don't always follow the standard URL
+    if pokedex.pokemon_entries:
+        sprite_urls = {pokemon_id: entry['sprite'] for pokemon_id, entry in pokedex.pokemon_entries.items() if entry['sprite']}
+    else:
+        sprite_urls = {pokemon_id: None for pokemon_id in range(1, DEFAULT_LIMIT + 1)}
+    pokemon_ids = sorted(sprite_urls)
+    if limit:
+        pokemon_ids = pokemon_ids[:limit]
+
+    try:
+        print(f"Pre-rendering sprites of {len(pokemon_ids)} Pokémon...")
+        results = await asyncio.gather(*(
+            prerender_pokemon(pokemon_id, sprite_urls[pokemon_id], semaphore) for pokemon_id in pokemon_ids
+        ))
+        print(f"Pre-rendered {len(MINIGAME_ASSETS)} assets for {sum(results)} Pokémon")
+    finally:
+        await close_http_session()
+
+def main():
+    parser = argparse.ArgumentParser(description="Download all sprites and pre-render the minigame images.")
+    parser.add_argument("--limit", type=int, default=0, help="Number of Pokémon to include (default: all)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Number of parallel downloads")
+    args = parser.parse_args()
+
+    asyncio.run(prerender(args.limit, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import os
+import sys
+import pytest
+
+# The bot runs from the repository root, make its packages importable the same way
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    """Point the database at a new file in a temporary directory"""
+    from data import database
+    path = str(tmp_path / "ankibot.db")
+    monkeypatch.setattr(database, "DB_FILE", path)
+    return path
+
+@pytest.fixture
+def manager(db_file):
+    """A database manager on a new database"""
+    from data.database import DatabaseManager
+    manager = DatabaseManager()
+    yield manager
+    manager.close()
@@ -0,0 +1,66 @@
+from data import evolutions
+from data.evolutions import EvolutionChain, index_chain, get_indexed_chain, get_species_chain
+
+EEVEE = [
+    ["eevee", None, None],
+    ["vaporeon", "eevee", " (Water stone)"],
+    ["jolteon", "eevee", " (Thunder stone)"],
+    ["flareon", "eevee", " (Fire stone)"],
+]
+
+WURMPLE = [
+    ["wurmple", None, None],
+    ["silcoon", "wurmple", " (Level 7)"],
+    ["beautifly", "silcoon", " (Level 10)"],
+    ["cascoon", "wurmple", " (Level 7)"],
+    ["dustox", "cascoon", " (Level 10)"],
+]
+
+def setup_function():
+    evolutions.indexed_chains.clear()
+    evolutions.species_chains.clear()
+
+def test_linear_chain():
+    chain = EvolutionChain(1, [["bulbasaur", None, None], ["ivysaur", "bulbasaur", " (Level 16)"],
+                               ["venusaur", "ivysaur", " (Level 32)"]])
+    assert chain.root == "bulbasaur"
+    assert not chain.is_branched()
+    assert chain.pre_evolutions("venusaur") == ["bulbasaur", "ivysaur"]
+    assert chain.next_stages("bulbasaur") == ["ivysaur"]
+    assert chain.next_stages("venusaur") == []
+    assert chain.line_text() == "Bulbasaur → Ivysaur (Level 16) → Venusaur (Level 32)"
+
+def test_branches_from_the_base_form():
+    chain = EvolutionChain(67, EEVEE)
+    assert chain.is_branched()
+    assert chain.next_stages("eevee") == ["vaporeon", "jolteon", "flareon"]
+    assert chain.pre_evolutions("flareon") == ["eevee"]
+    assert chain.branches() == [["eevee", "vaporeon"], ["eevee", "jolteon"], ["eevee", "flareon"]]
+
+def test_branches_after_the_base_form():
+    chain = EvolutionChain(135, WURMPLE)
+    assert chain.branches() == [["wurmple", "silcoon", "beautifly"], ["wurmple", "cascoon", "dustox"]]
+    assert chain.pre_evolutions("dustox") == ["wurmple", "cascoon"]
+    assert chain.line_text(highlight="cascoon") == (
+        "Wurmple → Silcoon (Level 7) → Beautifly (Level 10) | "
+        "Wurmple → **Cascoon (Level 7)** → Dustox (Level 10)"
+    )
+
+def test_single_stage_chain():
+    chain = EvolutionChain(128, [["tauros", None, None]])
+    assert chain.branches() == [["tauros"]]
+    assert chain.line_text() == "Tauros"
+
+def test_chains_are_indexed_once():
+    chain = index_chain(67, EEVEE)
+    assert get_indexed_chain(67) is chain
+    # Indexing the same chain again, e.g. for another species in it, reuses the first index
+    assert index_chain(67, []) is chain
+    assert get_indexed_chain(135) is None
+
+def test_every_member_finds_the_chain():
+    chain = index_chain(135, WURMPLE)
+    for species_name in ["wurmple", "silcoon", "beautifly", "cascoon", "dustox"]:
+        assert get_species_chain(species_name) is chain
+    assert get_species_chain("Dustox") is chain
+    assert get_species_chain("pikachu") is None
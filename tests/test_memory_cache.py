@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from data.memory_cache import LRUCache
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+def test_evicts_by_size():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"1234")
+    cache.set("c", b"123")
+
+    assert "a" not in cache
+    assert cache.size == 7
+
+    # Values larger than the whole cache are not stored and don't evict anything
+    cache.set("d", b"12345678901")
+    assert "d" not in cache
+    assert len(cache) == 2
+
+def test_replacing_a_value_updates_the_size():
+    cache = LRUCache(max_entries=10, max_bytes=100)
+    cache.set("a", b"12345")
+    cache.set("a", b"12")
+    assert cache.size == 2
+    cache.pop("a")
+    assert cache.size == 0
+
+def test_coalesce_shares_one_fetch():
+    cache = LRUCache(max_entries=10)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(cache.coalesce("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert calls == 1
+    assert cache.coalesced == 4
+    # The result is left to the caller to store
+    assert "key" not in cache
+
+def test_coalesce_shares_errors_and_allows_a_retry():
+    cache = LRUCache(max_entries=10)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("down")
+
+    async def succeed():
+        return "up"
+
+    async def run():
+        results = await asyncio.gather(cache.coalesce("key", fail), cache.coalesce("key", fail),
+                                       return_exceptions=True)
+        return results, await cache.coalesce("key", succeed)
+
+    results, retry = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retry == "up"
+    assert cache.stats()["in_flight"] == 0
+
+def test_cancelled_waiter_doesnt_cancel_the_fetch():
+    cache = LRUCache(max_entries=10)
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        owner = asyncio.ensure_future(cache.coalesce("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.coalesce("key", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await owner
+
+    assert asyncio.run(run()) == "result"
@@ -0,0 +1,66 @@
+import sqlite3
+import pytest
+from data.database import MIGRATIONS, DatabaseManager
+
+def count(manager, query, params=None):
+    return manager.fetch_one(query, params)[0]
+
+def test_new_database_is_fully_migrated(manager):
+    assert manager.get_schema_version() == len(MIGRATIONS)
+    indexes = {row["name"] for row in manager.fetch_all("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_user_badges_user_badge", "idx_event_participants_event_user"} <= indexes
+
+def test_migrations_run_once(db_file):
+    DatabaseManager().close()
+    manager = DatabaseManager()
+    assert count(manager, "SELECT COUNT(*) FROM schema_version") == len(MIGRATIONS)
+    manager.close()
+
+def test_migrations_upgrade_an_old_database(db_file):
+    # A database from before the migrations, with a badge awarded twice
+    DatabaseManager().close()
+    conn = sqlite3.connect(db_file)
+    conn.execute("DROP INDEX idx_user_badges_user_badge")
+    conn.execute("DELETE FROM schema_version")
+    conn.execute("INSERT INTO users (id) VALUES (1)")
+    conn.executemany("INSERT INTO user_badges (user_id, badge_name, acquired_from) VALUES (?, ?, ?)",
+                     [(1, "waterbadge", "first"), (1, "waterbadge", "second"), (1, "stonebadge", "other")])
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager()
+    assert manager.get_schema_version() == len(MIGRATIONS)
+    rows = manager.fetch_all("SELECT badge_name, acquired_from FROM user_badges WHERE user_id = 1 ORDER BY badge_name")
+    assert [tuple(row) for row in rows] == [("stonebadge", "other"), ("waterbadge", "first")]
+    with pytest.raises(sqlite3.IntegrityError):
+        manager.execute("INSERT INTO user_badges (user_id, badge_name) VALUES (1, 'waterbadge')")
+    manager.close()
+
+def test_references_are_repaired_before_foreign_keys_are_enforced(db_file, caplog):
+    # Rows written before foreign keys were enforced
+    DatabaseManager().close()
+    conn = sqlite3.connect(db_file)
+    conn.execute("INSERT INTO user_badges (user_id, badge_name, acquired_from) VALUES (2, 'waterbadge', 'event')")
+    conn.execute("INSERT INTO event_participants (event_id, user_id) VALUES (99, 3)")
+    conn.execute("INSERT INTO users (id) VALUES (4)")
+    conn.execute("INSERT INTO user_badges (user_id, badge_name, acquired_from) VALUES (4, 'nosuchbadge', 'event')")
+    conn.commit()
+    conn.close()
+
+    with caplog.at_level("WARNING", logger="data.database"):
+        manager = DatabaseManager()
+    # The missing user was added and the participant of the deleted event removed
+    assert count(manager, "SELECT COUNT(*) FROM users WHERE id = 2") == 1
+    assert count(manager, "SELECT COUNT(*) FROM event_participants") == 0
+    # The badge that no longer exists is kept and logged
+    assert [(row["table"], row["parent"]) for row in manager.fetch_all("PRAGMA foreign_key_check")] == [
+        ("user_badges", "badges")
+    ]
+    assert "1 rows in user_badges reference missing rows in badges" in caplog.text
+    assert count(manager, "PRAGMA foreign_keys") == 1
+    manager.close()
+
+def test_failed_write_doesnt_leave_a_transaction_open(manager):
+    with pytest.raises(sqlite3.IntegrityError):
+        manager.execute("INSERT INTO user_badges (user_id, badge_name) VALUES (404, 'waterbadge')")
+    assert not manager.get_connection().in_transaction
@@ -0,0 +1,99 @@
+import pytest
+from data import name_index
+
+NAMES = {
+    "bulbasaur": 1,
+    "charizard": 6,
+    "mr-mime": 122,
+    "farfetchd": 83,
+    "nidoran-f": 29,
+    "nidoran-m": 32,
+    "flabebe": 669,
+    "deoxys-normal": 386,
+    "deoxys-attack": 10001,
+    "charizard-mega-x": 10034,
+}
+
+SPECIES = {"deoxys-normal": "deoxys"}
+
+@pytest.fixture(autouse=True)
+def index():
+    name_index.build_index(NAMES, SPECIES, complete=True)
+
+@pytest.mark.parametrize("query, expected", [
+    ("Charizard", "charizard"),
+    ("  CHARIZARD ", "charizard"),
+    ("Mr. Mime", "mr-mime"),
+    ("mrmime", "mr-mime"),
+    ("Farfetch'd", "farfetchd"),
+    ("Nidoran♀", "nidoran-f"),
+    ("Flabébé", "flabebe"),
+    # Species names resolve to their default form
+    ("Deoxys", "deoxys-normal"),
+    ("Charizard Mega X", "charizard-mega-x"),
+])
+def test_resolve_names(query, expected):
+    assert name_index.resolve(query) == expected
+
+def test_resolve_ids():
+    assert name_index.resolve("#25") == 25
+    assert name_index.resolve(6) == 6
+
+def test_unknown_names():
+    assert name_index.resolve("missingno") is None
+    assert name_index.resolve("") is None
+
+    # An incomplete index can't rule a name out, so it is passed on to PokeAPI
+    name_index.build_index(NAMES, SPECIES, complete=False)
+    assert name_index.resolve("Missing No") == "missing-no"
+
+def test_search_prefix():
+    assert name_index.search_prefix("char") == ["charizard", "charizard-mega-x"]
+    assert name_index.search_prefix("nidoran") == ["nidoran-f", "nidoran-m"]
+    assert name_index.search_prefix("deo") == ["deoxys-normal", "deoxys-attack"]
+    assert name_index.search_prefix("zzz") == []
+
+def test_add_name():
+    name_index.add_name("pikachu", 25)
+    assert name_index.resolve("Pikachu") == "pikachu"
+    assert name_index.get_id("pikachu") == 25
+    assert name_index.search_prefix("pika") == ["pikachu"]
+
+@pytest.mark.parametrize("query, expected", [
+    ("charzard", "charizard"),
+    ("bulbasuar", "bulbasaur"),
+    ("mr mine", "mr-mime"),
+    ("deoxis", "deoxys-normal"),
+])
+def test_suggest_corrects_typos(query, expected):
+    assert name_index.suggest(query)[0] == expected
+
+def test_suggest_skips_dissimilar_names():
+    assert name_index.suggest("qwxz") == []
+    assert name_index.did_you_mean("qwxz") == ""
+    assert name_index.did_you_mean("charzard").startswith(" Did you mean **Charizard**")
+
+def test_suggest_finds_names_added_later():
+    name_index.suggest("warmup")  # Builds the trigram index
+    name_index.add_name("pikachu", 25)
+    assert name_index.suggest("pikachoo")[0] == "pikachu"
+
+def test_candidates_are_bounded():
+    # Many names sharing every trigram of the query
+    names = {f"charizard-form-{i}": 20000 + i for i in range(500)}
+    names["charizard"] = 6
+    name_index.build_index(names, {}, complete=True)
+
+    candidates = name_index.get_candidates("charzard")
+    assert len(candidates) <= name_index.CANDIDATE_TRIGRAMS * name_index.MAX_CANDIDATES_PER_TRIGRAM
+    # Names closest in length are taken first, so the exact spelling is always among them
+    assert "charizard" in candidates
+    assert name_index.suggest("charzard")[0] == "charizard"
+
+def test_species_ids():
+    assert name_index.get_species_id("charizard") == 6
+    assert name_index.get_species_id(6) == 6
+    # Alternate forms have their own IDs, their species is only known from PokeAPI
+    assert name_index.get_species_id("charizard-mega-x") is None
+    assert name_index.get_species_id(10034) is None
+    assert name_index.get_species_id("missingno") is None
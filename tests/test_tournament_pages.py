@@ -0,0 +1,65 @@
+import pytest
+from data.tournament import (
+    Tournament, REGION_ROUNDS, OVERVIEW_ROUNDS, bracket_region_count, get_match_region, get_bracket_page, _page_matches
+)
+
+GUILD_ID = 1
+
+@pytest.fixture(scope="module")
+def large():
+    return Tournament("Large", 1024, 1)
+
+@pytest.mark.parametrize("size, regions", [(2, 1), (16, 1), (32, 3), (64, 5), (1024, 69)])
+def test_region_count(size, regions):
+    assert bracket_region_count(Tournament("Cup", size, 1)) == regions
+
+def test_every_match_is_on_its_region_page(large):
+    pages = {}
+    for match in large.matches.values():
+        region = get_match_region(large, match.match_id)
+        if region not in pages:
+            page = get_bracket_page(large, GUILD_ID, region=region)
+            pages[region] = {m.match_id for matches in _page_matches(large, page).values() for m in matches}
+        assert match.match_id in pages[region], (match.round_num, match.position, region)
+    assert sorted(pages) == list(range(1, bracket_region_count(large) + 1))
+
+def test_region_pages_are_bounded(large):
+    for region in range(1, bracket_region_count(large) + 1):
+        page = get_bracket_page(large, GUILD_ID, region=region)
+        matches_by_round = _page_matches(large, page)
+        assert len(matches_by_round) <= REGION_ROUNDS
+        assert len(matches_by_round[page.first_round]) <= 2 ** (REGION_ROUNDS - 1)
+
+def test_region_stages(large):
+    assert get_bracket_page(large, GUILD_ID, region=1).title.endswith("(rounds 1-4)")
+    assert get_bracket_page(large, GUILD_ID, region=64).title.endswith("(rounds 1-4)")
+    assert get_bracket_page(large, GUILD_ID, region=65).title.endswith("(rounds 5-8)")
+    # The last stage is shorter, its page also shows the rounds before it
+    assert get_bracket_page(large, GUILD_ID, region=69).title.endswith("(rounds 7-10)")
+
+def test_invalid_region(large):
+    with pytest.raises(ValueError):
+        get_bracket_page(large, GUILD_ID, region=70)
+    with pytest.raises(ValueError):
+        get_bracket_page(large, GUILD_ID, region=-1)
+
+def test_auto_view():
+    small = Tournament("Small", 32, 1)
+    page = get_bracket_page(small, GUILD_ID)
+    assert page.key[-1] == "full"
+    assert page.first_round == 1
+
+    large = Tournament("Large", 64, 1)
+    page = get_bracket_page(large, GUILD_ID)
+    assert page.key[-1] == "overview"
+    assert page.first_round == 1
+
+def test_overview_shows_the_last_rounds(large):
+    page = get_bracket_page(large, GUILD_ID, view="overview")
+    assert page.first_round == 10 - OVERVIEW_ROUNDS + 1
+    matches_by_round = _page_matches(large, page)
+    assert len(matches_by_round[page.first_round]) == 2 ** (OVERVIEW_ROUNDS - 1)
+
+def test_pages_of_guilds_dont_share_keys():
+    tournament = Tournament("Cup", 8, 1)
+    assert get_bracket_page(tournament, 1).key != get_bracket_page(tournament, 2).key
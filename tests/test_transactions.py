@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from data import profiles
+from data.database import AsyncDatabase
+
+def test_transaction_commits_or_rolls_back(manager):
+    with manager.transaction():
+        manager.execute("INSERT INTO users (id) VALUES (1)")
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.execute("INSERT INTO users (id) VALUES (2)")
+            raise RuntimeError()
+
+    assert [row["id"] for row in manager.fetch_all("SELECT id FROM users")] == [1]
+
+def test_nested_transaction_is_a_savepoint(manager):
+    with manager.transaction():
+        manager.execute("INSERT INTO users (id) VALUES (1)")
+        with pytest.raises(RuntimeError):
+            with manager.transaction():
+                manager.execute("INSERT INTO users (id) VALUES (2)")
+                raise RuntimeError()
+        # Only the inner statements were rolled back
+        with manager.transaction():
+            manager.execute("INSERT INTO users (id) VALUES (3)")
+
+    assert [row["id"] for row in manager.fetch_all("SELECT id FROM users ORDER BY id")] == [1, 3]
+
+def test_outer_rollback_undoes_released_savepoints(manager):
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            with manager.transaction():
+                manager.execute("INSERT INTO users (id) VALUES (1)")
+            raise RuntimeError()
+
+    assert manager.fetch_one("SELECT COUNT(*) FROM users")[0] == 0
+    assert manager.transaction_depth == 0
+
+@pytest.fixture
+def async_db(db_file, monkeypatch):
+    async_db = AsyncDatabase()
+    monkeypatch.setattr(profiles, "db", async_db)
+    profiles.invalidate_profiles()
+    yield async_db
+    asyncio.run(async_db.close())
+
+def test_award_badges_is_idempotent(async_db):
+    async def run():
+        first = await profiles.award_badges_to_users([1, 2, 2, 3], "waterbadge", "Event")
+        second = await profiles.award_badges_to_users([2, 3, 4], "waterbadge", "Event")
+        rows = await async_db.fetch_all("SELECT user_id, COUNT(*) AS n FROM user_badges GROUP BY user_id ORDER BY user_id")
+        users = await async_db.fetch_one("SELECT COUNT(*) FROM users")
+        return first, second, [tuple(row) for row in rows], users[0]
+
+    first, second, rows, users = asyncio.run(run())
+    assert first == {1: True, 2: True, 3: True}
+    assert second == {2: False, 3: False, 4: True}
+    assert rows == [(1, 1), (2, 1), (3, 1), (4, 1)]
+    assert users == 4
+
+def test_concurrent_awards_store_a_badge_once(async_db):
+    async def run():
+        results = await asyncio.gather(*(profiles.award_badge(1, "waterbadge") for _ in range(10)))
+        return results, await profiles.get_user_badge_names(1)
+
+    results, badge_names = asyncio.run(run())
+    assert results.count(True) == 1
+    assert badge_names == ["waterbadge"]
+
+def test_unknown_badge_is_not_awarded(async_db):
+    async def run():
+        results = await profiles.award_badges_to_users([1, 2], "nosuchbadge")
+        return results, await async_db.fetch_one("SELECT COUNT(*) FROM user_badges")
+
+    results, row = asyncio.run(run())
+    assert results == {1: False, 2: False}
+    assert row[0] == 0
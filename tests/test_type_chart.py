@@ -0,0 +1,49 @@
+import itertools
+from data.pokemon import ALL_POKEMON_TYPES
+from data.type_chart import (
+    TYPE_EFFECTIVENESS, get_damage_multipliers, get_effectiveness, get_super_effective_types, get_team_matchups
+)
+
+def test_dual_types_multiply():
+    # Charizard
+    multipliers = get_damage_multipliers(["fire", "flying"])
+    assert multipliers["rock"] == 4.0
+    assert multipliers["water"] == 2.0
+    assert multipliers["electric"] == 2.0
+    assert multipliers["grass"] == 0.25
+    assert multipliers["ground"] == 0.0
+    assert multipliers["normal"] == 1.0
+
+def test_every_type_pair_matches_the_chart():
+    for first, second in itertools.combinations_with_replacement(ALL_POKEMON_TYPES, 2):
+        types = [first] if first == second else [first, second]
+        multipliers = get_damage_multipliers(types)
+        for attacking in ALL_POKEMON_TYPES:
+            expected = 1.0
+            for defending in types:
+                expected *= TYPE_EFFECTIVENESS[attacking].get(defending, 1.0)
+            assert multipliers[attacking] == expected, (attacking, types)
+
+def test_type_order_and_case_dont_matter():
+    assert get_damage_multipliers(["Water", "Ground"]) == get_damage_multipliers(["ground", "water"])
+    assert get_effectiveness("GRASS", ["water", "ground"]) == 4.0
+
+def test_unknown_types_are_neutral():
+    assert get_damage_multipliers(["ghost", "shadow"]) == get_damage_multipliers(["ghost"])
+    assert get_effectiveness("shadow", ["normal"]) == 1.0
+    assert get_super_effective_types("shadow") == []
+
+def test_team_matchups():
+    # Charizard, Gyarados and Ferrothorn
+    team = get_team_matchups([["fire", "flying"], ["water", "flying"], ["grass", "steel"]])
+
+    # Ferrothorn resists electric, which hits Gyarados for 4x and Charizard for 2x
+    assert team["matchups"]["electric"] == {"weak": 2, "resist": 1, "immune": 0}
+    assert team["matchups"]["ground"] == {"weak": 0, "resist": 0, "immune": 2}
+    assert team["weaknesses"] == ["electric", "rock"]
+    assert "ground" in team["resistances"]
+    # Ice is neutral against all three
+    assert "ice" in team["unresisted"]
+    # Water covers fire types, nothing on the team covers normal types
+    assert "fire" not in team["coverage_gaps"]
+    assert "normal" in team["coverage_gaps"]